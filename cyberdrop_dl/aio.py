@@ -22,6 +22,7 @@ if TYPE_CHECKING:
         AsyncIterable,
         AsyncIterator,
         Awaitable,
+        Buffer,
         Callable,
         Coroutine,
         Iterable,
@@ -84,6 +85,10 @@ class WeakAsyncLocks[T]:
 class RateLimiter(AsyncLimiter):
     __slots__ = ()
 
+    @property
+    def unlimited(self) -> bool:
+        return self.max_rate == 0
+
     async def acquire(self, amount: float = 1) -> None:
         if self.max_rate == 0:
             return
@@ -136,8 +141,13 @@ class AsyncIOWrapper[AnyStr: (bytes, str)]:
     async def readlines(self) -> list[AnyStr]:
         return await asyncio.to_thread(self._io.readlines)
 
-    async def write(self, b: AnyStr, /) -> int:
-        return await asyncio.to_thread(self._io.write, b)
+    @overload
+    async def write(self: AsyncIOWrapper[bytes], b: Buffer, /) -> int: ...
+    @overload
+    async def write(self: AsyncIOWrapper[str], b: str, /) -> int: ...
+    async def write(self, b: Buffer | str, /) -> int:
+        # IO[bytes].write accepts any buffer (bytearray, memoryview), not just bytes
+        return await asyncio.to_thread(self._io.write, cast("AnyStr", b))
 
     async def writelines(self, lines: Iterable[AnyStr], /) -> None:
         return await asyncio.to_thread(self._io.writelines, lines)
@@ -272,13 +282,23 @@ def to_thread[**P, R](fn: Callable[P, R]) -> Callable[P, Coroutine[None, None, R
     return async_run
 
 
+def _move_file(src: Path, dst: Path) -> Path:
+    """Like `shutil.move`, but tries a single `Path.replace` (one syscall, no stat) first.
+
+    Falls back to `shutil.move` if `dst` is a directory or is in another filesystem"""
+    try:
+        return Path(src).replace(dst)
+    except OSError:
+        return Path(shutil.move(src, dst))
+
+
 chmod = to_thread(Path.chmod)
 copy = to_thread(shutil.copy)
 exists = to_thread(Path.exists)
 is_dir = to_thread(Path.is_dir)
 is_file = to_thread(Path.is_file)
 mkdir = to_thread(Path.mkdir)
-move = to_thread(shutil.move)
+move = to_thread(_move_file)
 read_bytes = to_thread(Path.read_bytes)
 read_text = to_thread(Path.read_text)
 resolve = to_thread(Path.resolve)
@@ -339,6 +359,19 @@ def open(  # noqa: PLR0913
     return AsyncIOWrapper(coro)
 
 
+def _open_w_parents(path: Path, mode: OpenBinaryMode) -> IO[bytes]:
+    try:
+        return path.open(mode)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.open(mode)
+
+
+def open_w_parents(path: Path, mode: OpenBinaryMode) -> AsyncIOWrapper[bytes]:
+    """Like `open` (binary only), but creates the parent folders if they do not exist, in the same thread hop"""
+    return AsyncIOWrapper(asyncio.to_thread(_open_w_parents, path, mode))
+
+
 async def get_size(path: Path) -> int | None:
     """If path exists and is a file, returns its size. Returns `None` otherwise"""
 
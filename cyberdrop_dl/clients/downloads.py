@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import itertools
 import logging
+import re
 import time
 from http import HTTPStatus
 from typing import TYPE_CHECKING, Any, final
@@ -33,9 +35,11 @@ logger = logging.getLogger(__name__)
 
 
 _CONTENT_TYPES_OVERRIDES: dict[str, str] = {"text/vnd.trolltech.linguist": "video/MP2T"}
+_CONTENT_TYPES_OVERRIDES_REGEX = re.compile("|".join(map(re.escape, _CONTENT_TYPES_OVERRIDES)))
 _SLOW_DOWNLOAD_PERIOD: int = 10  # seconds
-_FREE_SPACE_CHECK_PERIOD: int = 5  # Check every 5 chunks
 _USE_IMPERSONATION: set[str] = {"vsco", "celebforum"}
+WRITE_BUFFER_SIZE: int = 1024 * 1024 * 8  # 8MB
+_PROGRESS_UPDATE_PERIOD: float = 0.05  # seconds
 
 
 @final
@@ -159,25 +163,40 @@ class DownloadClient:
         check_free_space = storage.create_free_space_checker(media_item)
         check_download_speed = make_speed_checker(media_item, hook, self.download_speed_threshold)
         await check_free_space()
-        await self._pre_download_check(media_item)
 
-        async with aio.open(media_item.partial_file, mode="ab") as f:
-            async for chunk in resp.iter_chunked(self.chunk_size):
-                n_bytes = len(chunk)
-                await self.speed_limiter.acquire(n_bytes)
-                await check_free_space()
-                await f.write(chunk)
-                hook.advance(n_bytes)
-                check_download_speed()
+        # Network reads are usually small. Buffer them to write to disk in fewer thread hops
+        buffer = bytearray()
+        speed_limited = not self.speed_limiter.unlimited
+        # The TUI does not need an update per chunk. Report progress in batches
+        pending_progress = 0
+        next_progress_update = 0.0
+        async with aio.open_w_parents(media_item.partial_file, mode="ab") as f:
+            try:
+                async for chunk in resp.iter_chunked(self.chunk_size):
+                    n_bytes = len(chunk)
+                    if speed_limited:
+                        await self.speed_limiter.acquire(n_bytes)
+                    await check_free_space()
+                    buffer += chunk
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        await f.write(buffer)
+                        buffer.clear()
+                    pending_progress += n_bytes
+                    if (now := time.monotonic()) >= next_progress_update:
+                        hook.advance(pending_progress)
+                        pending_progress = 0
+                        next_progress_update = now + _PROGRESS_UPDATE_PERIOD
+                        check_download_speed()
+
+                if pending_progress:
+                    hook.advance(pending_progress)
+            finally:
+                # Keep everything we got, so the download can be resumed
+                if buffer:
+                    await f.write(buffer)
 
         await self._post_download_check(media_item)
 
-    @aio.to_thread
-    def _pre_download_check(self, media_item: MediaItem) -> None:
-        media_item.partial_file.parent.mkdir(parents=True, exist_ok=True)
-        if not media_item.partial_file.is_file():
-            media_item.partial_file.touch()
-
     async def _post_download_check(self, media_item: MediaItem, *_: Any) -> None:
         size = await aio.get_size(media_item.partial_file)
         if not size:
@@ -239,8 +258,12 @@ class DownloadClient:
     async def add_file_size(self, domain: str, media_item: MediaItem) -> None:
         if not media_item.path:
             media_item.path = self.get_file_location(media_item)
-        if await aio.is_file(media_item.path):
-            await self.manager.database.history.add_filesize(domain, media_item)
+        try:
+            size = await aio.get_size(media_item.path)
+        except IsADirectoryError:
+            return
+        if size is not None:
+            await self.manager.database.history.add_filesize(domain, media_item, size=size)
 
     async def handle_media_item_completion(self, media_item: MediaItem, *, downloaded: bool = False) -> None:
         """Sends to hash client to handle hashing and marks as completed/current download."""
@@ -396,17 +419,24 @@ def _get_content_type(headers: Mapping[str, str]) -> str | None:
     if not content_type:
         return None
 
-    override_key = next((name for name in _CONTENT_TYPES_OVERRIDES if name in content_type), "<NO_OVERRIDE>")
-    return _CONTENT_TYPES_OVERRIDES.get(override_key) or content_type
+    if match := _CONTENT_TYPES_OVERRIDES_REGEX.search(content_type):
+        return _CONTENT_TYPES_OVERRIDES[match.group()]
+    return content_type
 
 
 def _get_last_modified(headers: Mapping[str, str]) -> int | None:
     if date_str := headers.get(hdrs.LAST_MODIFIED):
-        return int(dates.parse_http(date_str).timestamp())
+        return _parse_last_modified(date_str)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_last_modified(date_str: str) -> int:
+    # Files of the same album are usually uploaded (and stamped by the CDN) at the same time
+    return int(dates.parse_http(date_str).timestamp())
 
 
 def _is_html_or_text(content_type: str) -> bool:
-    return any(s in content_type for s in ("html", "text"))
+    return "html" in content_type or "text" in content_type
 
 
 def _check_content_length(headers: Mapping[str, str]) -> None:
@@ -424,9 +454,10 @@ async def filter_by_duration(media_item: MediaItem, config: Config) -> bool:
         return False
 
     duration_limits = config.filters.duration.ranges
-    if media_item.ext.lower() in FileExt.VIDEO:
+    ext = media_item.ext.lower()
+    if ext in FileExt.VIDEO:
         limits = duration_limits.video
-    elif media_item.ext.lower() in FileExt.AUDIO:
+    elif ext in FileExt.AUDIO:
         limits = duration_limits.audio
     else:
         return False
@@ -483,9 +514,7 @@ def make_speed_checker(media_item: MediaItem, hook: ProgressHook, speed_threshol
 
 
 def _get_content_length(headers: Mapping[str, str]) -> int:
-    try:
-        return int(headers[hdrs.CONTENT_LENGTH])
-    except KeyError:
+    content_length = headers.get(hdrs.CONTENT_LENGTH)
+    if content_length is None:
         return 0
-        msg = f"Download response has no `{hdrs.CONTENT_LENGTH}` header. Refusing to download"
-        raise DownloadError(HTTPStatus.LENGTH_REQUIRED, msg, retry=False) from None
+    return int(content_length)
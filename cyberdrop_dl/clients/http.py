@@ -40,6 +40,9 @@ RequestContext = contextlib._AsyncGeneratorContextManager[AbstractResponse[Any]]
 
 logger = logging.getLogger(__name__)
 
+# aiohttp's default (64KB) caps how much each read of a download can return
+_READ_BUFSIZE: int = 1024 * 1024  # 1MB
+
 
 class _LazyResponseLog:
     def __init__(self, response: AbstractResponse[Any]) -> None:
@@ -163,8 +166,10 @@ class HTTPClient:
                 sock_read=self.config.network.read_timeout,
             ),
             proxy=self.config.network.proxy,
-            connector=tcp.create_connector(self._ssl_context),
+            # The default pool (100) is shared by scraping and downloads. Make sure downloads can never exhaust it
+            connector=tcp.create_connector(self._ssl_context, limit=100 + self.config.downloads.concurrency),
             requote_redirect_url=False,
+            read_bufsize=_READ_BUFSIZE,
         )
 
     async def load_cookie_files(self, cookie_files: list[Path]) -> None:
@@ -16,6 +16,8 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 _DNS_CLS: type[aiohttp.AsyncResolver | aiohttp.ThreadedResolver] | None = None
+_KEEPALIVE_TIMEOUT: int = 75  # seconds
+_DNS_CACHE_TTL: int = 300  # seconds
 
 
 async def _get_dns_resolver(
@@ -53,10 +55,18 @@ async def choose_dns_resolver() -> type[aiohttp.AsyncResolver | aiohttp.Threaded
     return _DNS_CLS
 
 
-def create_connector(ssl_context: ssl.SSLContext | bool, /) -> aiohttp.TCPConnector:  # noqa: FBT001
+def create_connector(ssl_context: ssl.SSLContext | bool, /, *, limit: int = 100) -> aiohttp.TCPConnector:  # noqa: FBT001
     if _DNS_CLS is None:
         raise RuntimeError("DNS resolver is unknown")
-    tcp_conn = aiohttp.TCPConnector(ssl=ssl_context, resolver=_DNS_CLS())
+    # Downloads are already limited per domain by the downloaders, so no limit_per_host here.
+    # Keep idle connections alive long enough to be reused by the next file on the same server
+    tcp_conn = aiohttp.TCPConnector(
+        ssl=ssl_context,
+        resolver=_DNS_CLS(),
+        limit=limit,
+        keepalive_timeout=_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=_DNS_CACHE_TTL,
+    )
     tcp_conn._resolver_owner = True
     return tcp_conn
 
@@ -495,9 +495,9 @@ class Crawler(HTTPMixin, HLSMixin, ABC):
             parents=tuple(scrape_item.parents),
             uploaded_at=scrape_item.uploaded_at,
             debrid_url=debrid_link,
+            headers=self._prepare_headers(scrape_item),
         )
 
-        media_item.headers.update(self._prepare_headers(scrape_item))
         if metadata:
             media_item.metadata = metadata
 
@@ -1025,10 +1025,15 @@ def _should_skip_by_config(media_item: MediaItem, config: Config) -> bool:
 def _prepare_download_path(item: ScrapeItem, domain: str) -> Path:
     path = item.download_folder / item.path
     if item.is_loose_file:
-        path = path / f"Loose Files ({domain})"
+        path = path / _loose_files_folder(domain)
     return path
 
 
+@functools.lru_cache(maxsize=64)
+def _loose_files_folder(domain: str) -> Path:
+    return Path(f"Loose Files ({domain})")
+
+
 def create_title(
     config: Config,
     domain: str,
@@ -37,7 +37,16 @@ class CSVFiles:
     jsonl_file: Path
 
     def __iter__(self) -> Iterator[Path]:
-        return iter(dataclasses.astuple(self))
+        return iter(
+            (
+                self.main_log,
+                self.unsupported_urls,
+                self.download_errors,
+                self.scrape_errors,
+                self.last_forum_post,
+                self.jsonl_file,
+            )
+        )
 
 
 @dataclasses.dataclass(slots=True)
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import contextlib
 import dataclasses
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, Final, Self
 
 from cyberdrop_dl import aio
 
-from .common import pre_allocate_250mb, raw_connect
+from .common import open_reader, pre_allocate_250mb, raw_connect, set_pragmas
 from .hash import HashTable
 from .history import HistoryTable
 from .schema import SchemaTable
@@ -18,6 +18,9 @@ if TYPE_CHECKING:
     import aiosqlite
 
 
+_READ_CONNECTIONS: Final = 2
+
+
 @dataclasses.dataclass(slots=True)
 class Database:
     path: Path
@@ -28,28 +31,45 @@ class Database:
     schema: SchemaTable = dataclasses.field(init=False)
 
     conn: aiosqlite.Connection = dataclasses.field(init=False)
+    readers: list[aiosqlite.Connection] = dataclasses.field(init=False, default_factory=list)
     is_new: bool = dataclasses.field(init=False)
 
     async def _connect(self) -> None:
         self.is_new = not await aio.get_size(self.path)
         self.conn = await raw_connect(self.path)
-        self.history = HistoryTable(self.conn, self.ignore_history)
-        self.hash = HashTable(self.conn, self.ignore_history)
+        try:
+            # Must run before switching to WAL mode
+            await pre_allocate_250mb(self.conn)
+            if await set_pragmas(self.conn, self.path):
+                # WAL allows readers to run concurrently with the writer
+                for _ in range(_READ_CONNECTIONS):
+                    self.readers.append(await open_reader(self.path))
+        except Exception:
+            await self._close()
+            raise
+
+        self.history = HistoryTable(self.conn, self.ignore_history, tuple(self.readers))
+        self.hash = HashTable(self.conn, self.ignore_history, tuple(self.readers))
         self.schema = SchemaTable(self.conn, self.ignore_history)
 
+    async def _close(self) -> None:
+        for reader in self.readers:
+            await reader.close()
+        self.readers.clear()
+        await self.conn.close()
+
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncGenerator[Self]:
         await self._connect()
         try:
             yield self
         finally:
-            await self.conn.close()
+            await self._close()
 
     async def _create_tables(self) -> None:
         await self.schema.create()
         if not self.is_new:
             self.schema.check_version()
-        await pre_allocate_250mb(self.conn)
         await self.history.create()
         await self.hash.create()
         if self.is_new:
@@ -59,7 +79,7 @@ class Database:
         try:
             await self._create_tables()
         except Exception:
-            await self.conn.close()
+            await self._close()
             if self.is_new:
                 try:
                     await aio.unlink(self.path, missing_ok=True)
@@ -77,4 +97,4 @@ class Database:
         return self
 
     async def __aexit__(self, *_: object) -> None:
-        await self.conn.close()
+        await self._close()
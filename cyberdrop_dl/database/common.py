@@ -2,26 +2,47 @@ from __future__ import annotations
 
 import contextlib
 import dataclasses
+import itertools
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar, Final
 
 import aiosqlite
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Iterator, Sequence
     from pathlib import Path
 
 
+MAX_VARIABLES_PER_QUERY: Final = 999  # SQLite's conservative default limit
+_CONNECTION_PRAGMAS: Final = (
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA mmap_size=268435456;"  # 256 MiB
+    "PRAGMA cache_size=-65536;"  # 64 MiB
+)
+
+
 @dataclasses.dataclass(slots=True)
 class Table(ABC):
     NAME: ClassVar[str]
     db_conn: aiosqlite.Connection
     ignore_history: bool = False
+    readers: Sequence[aiosqlite.Connection] = ()
+    _readers: Iterator[aiosqlite.Connection] = dataclasses.field(init=False, repr=False)
 
     def __init_subclass__(cls, name: str | None = None) -> None:
         if name:
             cls.NAME = name
 
+    def __post_init__(self) -> None:
+        self._readers = itertools.cycle(self.readers or (self.db_conn,))
+
+    @property
+    def reader(self) -> aiosqlite.Connection:
+        """Connection for read only queries, so they do not have to wait behind writes.
+
+        Returns the main connection if there are no read only connections"""
+        return next(self._readers)
+
     @abstractmethod
     async def create(self) -> None: ...
 
@@ -31,12 +52,55 @@ class Table(ABC):
         return await cursor.fetchone() is not None
 
 
+async def insert_multi_values(
+    cursor: aiosqlite.Cursor,
+    query: str,
+    row_template: str,
+    rows: Sequence[tuple[Any, ...]],
+) -> None:
+    """Inserts rows with `INSERT ... VALUES (...), (...)` statements, chunked to respect the variables limit.
+
+    `query` is the statement up to (but not including) the `VALUES` clause"""
+    if not rows:
+        return
+
+    chunk_size = max(1, MAX_VARIABLES_PER_QUERY // len(rows[0]))
+    for chunk in itertools.batched(rows, chunk_size):
+        values = ", ".join([row_template] * len(chunk))
+        await cursor.execute(f"{query} VALUES {values};", tuple(itertools.chain.from_iterable(chunk)))
+
+
 async def raw_connect(path: Path) -> aiosqlite.Connection:
     db_conn = await aiosqlite.connect(path, timeout=20)
     db_conn.row_factory = aiosqlite.Row
     return db_conn
 
 
+async def set_pragmas(db_conn: aiosqlite.Connection, path: Path) -> bool:
+    """Tune the connection for a write heavy workload with lots of small commits.
+
+    Returns `True` if the database is in WAL mode"""
+
+    script = _CONNECTION_PRAGMAS + "PRAGMA synchronous=NORMAL;PRAGMA journal_size_limit=67108864;"  # 64 MiB journal
+    if str(path) != ":memory:":
+        script = "PRAGMA journal_mode=WAL;" + script
+    _ = await db_conn.executescript(script)
+    cursor = await db_conn.execute("PRAGMA journal_mode;")
+    row = await cursor.fetchone()
+    return row is not None and row[0] == "wal"
+
+
+async def open_reader(path: Path) -> aiosqlite.Connection:
+    """Opens a read only connection. Only useful if the database is in WAL mode"""
+    db_conn = await raw_connect(path)
+    try:
+        _ = await db_conn.executescript(_CONNECTION_PRAGMAS + "PRAGMA query_only=1;")
+    except Exception:
+        await db_conn.close()
+        raise
+    return db_conn
+
+
 @contextlib.asynccontextmanager
 async def connect(path: Path) -> AsyncGenerator[aiosqlite.Connection]:
     db_conn = await raw_connect(path)
@@ -47,7 +111,14 @@ async def connect(path: Path) -> AsyncGenerator[aiosqlite.Connection]:
 
 
 async def pre_allocate_250mb(db_conn: aiosqlite.Connection) -> None:
-    """Pre-allocate 250MB of space to the SQL file just in case the user runs out of disk space."""
+    """Pre-allocate 250MB of space to the SQL file just in case the user runs out of disk space.
+
+    Skipped in WAL mode, where the blob would be written twice (to the WAL and then to the main file)"""
+
+    cursor = await db_conn.execute("PRAGMA journal_mode;")
+    journal_mode = await cursor.fetchone()
+    if journal_mode is not None and journal_mode[0] == "wal":
+        return
 
     cursor = await db_conn.execute("PRAGMA freelist_count;")
     free_space = await cursor.fetchone()
@@ -65,4 +65,7 @@ CREATE INDEX IF NOT EXISTS idx_media_domain_url_path_referer
 
 CREATE INDEX IF NOT EXISTS idx_media_domain_referer_completed
     ON media (domain, referer, completed);
+
+CREATE INDEX IF NOT EXISTS idx_media_created_at
+    ON media (created_at);
 """
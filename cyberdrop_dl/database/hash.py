@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import dataclasses
+import itertools
 import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 from cyberdrop_dl import aio
 
-from .common import Table
+from .common import MAX_VARIABLES_PER_QUERY, Table
 from .definitions import CREATE_FILES, CREATE_HASH, CREATE_HASH_INDEX
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
     import aiosqlite
 
     from cyberdrop_dl.url_objects import AbsoluteHttpURL
@@ -23,6 +26,11 @@ logger = logging.getLogger(__name__)
 class HashTable(Table, name="hash"):
     cwd: Path = dataclasses.field(init=False, default_factory=lambda: Path.cwd().expanduser().resolve())
 
+    def _split(self, file: Path | str) -> tuple[str, str]:
+        """Returns the (folder, filename) of the file, relative to cwd if not absolute"""
+        path = Path(self.cwd, file)
+        return str(path.parent), path.name
+
     async def create(self) -> None:
         for query in (
             CREATE_FILES,
@@ -35,13 +43,17 @@ class HashTable(Table, name="hash"):
 
     async def get_file_hash_exists(self, path: Path | str, hash_type: str) -> str | None:
         query = "SELECT hash FROM hash WHERE folder= ? AND download_filename= ? AND hash_type= ? AND hash IS NOT NULL LIMIT 1;"
-        path = self.cwd / path
-        folder = str(path.parent)
-        filename = path.name
-        cursor = await self.db_conn.execute(query, (folder, filename, hash_type))
+        folder, filename = self._split(path)
+        cursor = await self.reader.execute(query, (folder, filename, hash_type))
         if row := await cursor.fetchone():
             return row["hash"]
 
+    async def get_file_hashes(self, path: Path | str) -> dict[str, str]:
+        """Returns every saved hash of the file as a `{hash_type: hash}` mapping, with a single query"""
+        query = "SELECT hash_type, hash FROM hash WHERE folder= ? AND download_filename= ? AND hash IS NOT NULL;"
+        rows = await self.reader.execute_fetchall(query, self._split(path))
+        return {row["hash_type"]: row["hash"] for row in rows}
+
     async def get_files_with_hash_matches(
         self,
         hash_value: str,
@@ -79,15 +91,40 @@ class HashTable(Table, name="hash"):
               AND hash.hash_type = ?;
             """
 
-        rows = await self.db_conn.execute_fetchall(query, (hash_value, size, hash_algo))
+        rows = await self.reader.execute_fetchall(query, (hash_value, size, hash_algo))
         return cast("list[aiosqlite.Row]", rows)
 
+    async def get_files_with_hash_matches_many(self, hash_values: Iterable[str], hash_algo: str) -> list[aiosqlite.Row]:
+        """Like `get_files_with_hash_matches`, but for many hashes at once, chunked to respect the variables limit.
+
+        Rows include the `hash` and `file_size` columns so callers can group them"""
+        rows: list[aiosqlite.Row] = []
+        for chunk in itertools.batched(hash_values, MAX_VARIABLES_PER_QUERY - 1):
+            placeholders = ", ".join("?" * len(chunk))
+            # Only the number of placeholders is interpolated. Values are always bound as parameters
+            query = f"""
+            SELECT
+              hash.hash,
+              files.file_size,
+              files.folder,
+              files.download_filename
+            FROM
+              hash
+              JOIN files ON hash.folder = files.folder
+              AND hash.download_filename = files.download_filename
+            WHERE
+              hash.hash_type = ?
+              AND hash.hash IN ({placeholders});
+            """  # noqa: S608
+            rows.extend(await self.reader.execute_fetchall(query, (hash_algo, *chunk)))
+        return rows
+
     async def check_hash_exists(self, hash_type: str, hash_value: str) -> bool:
         if self.ignore_history:
             return False
 
         query = "SELECT 1 FROM hash WHERE hash.hash_type = ? AND hash.hash = ? LIMIT 1;"
-        cursor = await self.db_conn.execute(query, (hash_type, hash_value))
+        cursor = await self.reader.execute(query, (hash_type, hash_value))
         return await cursor.fetchone() is not None
 
     async def insert_or_update_hash_db(
@@ -98,10 +135,39 @@ class HashTable(Table, name="hash"):
         original_filename: str | None,
         referer: AbsoluteHttpURL | None,
     ) -> None:
-        await self.insert_or_update_hashes(hash_value, hash_algo, file)
-        await self.insert_or_update_file(original_filename, referer, file)
+        await self.insert_or_update_file_hashes({hash_algo: hash_value}, file, original_filename, referer)
+
+    async def insert_or_update_file_hashes(
+        self,
+        hashes: Mapping[str, str],
+        file: Path | str,
+        original_filename: str | None,
+        referer: AbsoluteHttpURL | None,
+    ) -> None:
+        """Saves every hash of the file, and the file itself, with a single commit"""
+        await self.insert_or_update_hashes_many(
+            ((hash_value, hash_type, file) for hash_type, hash_value in hashes.items()), commit=False
+        )
+        await self.insert_or_update_file(original_filename, referer, file, commit=False)
+        await self.db_conn.commit()
 
-    async def insert_or_update_hashes(self, hash_value: str, hash_type: str, file: Path | str) -> None:
+    async def insert_or_update_hashes(
+        self,
+        hash_value: str,
+        hash_type: str,
+        file: Path | str,
+        *,
+        commit: bool = True,
+    ) -> None:
+        await self.insert_or_update_hashes_many([(hash_value, hash_type, file)], commit=commit)
+
+    async def insert_or_update_hashes_many(
+        self,
+        hashes: Iterable[tuple[str, str, Path | str]],
+        *,
+        commit: bool = True,
+    ) -> None:
+        """Upserts (hash_value, hash_type, file) rows with executemany"""
         query = """
         INSERT INTO hash (
           hash, hash_type, folder, download_filename
@@ -112,20 +178,21 @@ class HashTable(Table, name="hash"):
           ) DO
         UPDATE
         SET
-          hash = ?;
+          hash = excluded.hash;
         """
 
-        full_path = self.cwd / file
-        download_filename = full_path.name
-        folder = str(full_path.parent)
-        await self.db_conn.execute(query, (hash_value, hash_type, folder, download_filename, hash_value))
-        await self.db_conn.commit()
+        rows = [(hash_value, hash_type, *self._split(file)) for hash_value, hash_type, file in hashes]
+        await self.db_conn.executemany(query, rows)
+        if commit:
+            await self.db_conn.commit()
 
     async def insert_or_update_file(
         self,
         original_filename: str | None,
         referer: AbsoluteHttpURL | str | None,
         file: Path | str,
+        *,
+        commit: bool = True,
     ) -> None:
         query = """
         INSERT INTO files (
@@ -142,9 +209,8 @@ class HashTable(Table, name="hash"):
           date = ?;
         """
         referer_ = str(referer) if referer else None
-        full_path = self.cwd / file
-        download_filename = full_path.name
-        folder = str(full_path.parent)
+        full_path = Path(self.cwd, file)
+        folder, download_filename = str(full_path.parent), full_path.name
         stat = await aio.stat(full_path)
         file_size = stat.st_size
         file_date = int(stat.st_mtime)
@@ -163,4 +229,5 @@ class HashTable(Table, name="hash"):
                 file_date,
             ),
         )
-        await self.db_conn.commit()
+        if commit:
+            await self.db_conn.commit()
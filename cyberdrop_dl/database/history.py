@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import dataclasses
+import json
 import logging
 import time
 from sqlite3 import IntegrityError
 from typing import TYPE_CHECKING, Any
 
-from .common import Table
+from cyberdrop_dl import aio
+
+from .common import Table, insert_multi_values
 from .definitions import CREATE_HISTORY, CREATE_MEDIA_INDEX
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Generator
+    from collections.abc import Callable, Generator, Iterable
 
     import aiosqlite
 
@@ -22,7 +27,11 @@ _FETCH_MANY_SIZE: int = 1000
 logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass(slots=True)
 class HistoryTable(Table, name="media"):
+    _pending_incompleted: list[tuple[str, MediaItem]] = dataclasses.field(init=False, default_factory=list)
+    _incompleted_flush: asyncio.Future[None] | None = dataclasses.field(init=False, default=None)
+
     async def create(self) -> None:
         await self.db_conn.execute(CREATE_HISTORY)
         await self.db_conn.executescript(CREATE_MEDIA_INDEX)
@@ -38,7 +47,7 @@ class HistoryTable(Table, name="media"):
             return "", False
 
         query = "SELECT referer, completed FROM media WHERE domain = ? and url_path = ? LIMIT 1;"
-        cursor = await self.db_conn.execute(query, (domain, db_path))
+        cursor = await self.reader.execute(query, (domain, db_path))
         if row := await cursor.fetchone():
             return row["referer"], bool(row["completed"])
         return "", False
@@ -52,9 +61,18 @@ class HistoryTable(Table, name="media"):
         if self.ignore_history:
             return {}
 
-        query = "SELECT url_path, completed FROM media WHERE domain = ? and album_id = ?"
-        rows = await self.db_conn.execute_fetchall(query, (domain, album_id))
-        return {row["url_path"]: bool(row["completed"]) for row in rows}
+        # Build the mapping in SQLite to skip creating a Row object per file
+        query = """
+        SELECT
+          json_group_object(
+            url_path, json(CASE WHEN completed THEN 'true' ELSE 'false' END)
+          ) AS results
+        FROM media
+        WHERE domain = ? and album_id = ? and url_path IS NOT NULL
+        """
+        cursor = await self.reader.execute(query, (domain, album_id))
+        row = await cursor.fetchone()
+        return json.loads(row["results"]) if row else {}
 
     async def set_album_id(self, domain: str, media_item: MediaItem) -> None:
         query = "UPDATE media SET album_id = ? WHERE domain = ? and url_path = ?"
@@ -72,19 +90,51 @@ class HistoryTable(Table, name="media"):
             query = "SELECT 1 FROM media WHERE domain = ? AND referer = ? AND completed != 0 LIMIT 1"
             params = domain, str(referer)
 
-        cursor = await self.db_conn.execute(query, params)
+        cursor = await self.reader.execute(query, params)
         return await cursor.fetchone() is not None
 
     async def insert_incompleted(self, domain: str, media_item: MediaItem) -> None:
-        url_path = media_item.db_path
-        download_filename = media_item.download_filename or ""
+        """Inserts the media item as incomplete.
+
+        Items from concurrent calls are inserted together, with a single commit"""
+        self._pending_incompleted.append((domain, media_item))
+        if self._incompleted_flush is None:
+            self._incompleted_flush = asyncio.ensure_future(self._flush_incompleted())
+        await asyncio.shield(self._incompleted_flush)
+
+    async def _flush_incompleted(self) -> None:
+        # Give every other download started in this loop iteration a chance to queue its item
+        await asyncio.sleep(0)
+        pending, self._pending_incompleted = self._pending_incompleted, []
+        self._incompleted_flush = None
+        by_domain: dict[str, list[MediaItem]] = {}
+        for domain, media_item in pending:
+            by_domain.setdefault(domain, []).append(media_item)
+        for domain, media_items in by_domain.items():
+            await self.insert_incompleted_many(domain, media_items)
+
+    async def insert_incompleted_many(self, domain: str, media_items: Iterable[MediaItem]) -> None:
+        """Inserts every media item as incomplete with a single commit."""
+        rows = [
+            (
+                domain,
+                media_item.db_path,
+                str(media_item.referer),
+                media_item.album_id,
+                str(media_item.download_folder),
+                media_item.download_filename or "",
+                media_item.original_filename,
+            )
+            for media_item in media_items
+        ]
+        if not rows:
+            return
+
         cursor = await self.db_conn.cursor()
-        query = "UPDATE media SET domain = ?, album_id = ? WHERE domain = 'no_crawler' and url_path = ? and referer = ?"
-        try:
-            await cursor.execute(query, (domain, media_item.album_id, url_path, str(media_item.referer)))
-        except IntegrityError:
-            delete_query = "DELETE FROM media WHERE domain = 'no_crawler' and url_path = ?"
-            await cursor.execute(delete_query, (url_path,))
+        await _claim_no_crawler_rows(
+            cursor,
+            [(domain, album_id, url_path, referer) for _, url_path, referer, album_id, *_ in rows],
+        )
 
         insert_query = """
         INSERT OR IGNORE INTO media (
@@ -92,28 +142,12 @@ class HistoryTable(Table, name="media"):
           download_path, download_filename,
           original_filename, completed, created_at
         )
-        VALUES
-          (
-            ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP
-          );
         """
 
-        await cursor.execute(
-            insert_query,
-            (
-                domain,
-                url_path,
-                str(media_item.referer),
-                media_item.album_id,
-                str(media_item.download_folder),
-                download_filename,
-                media_item.original_filename,
-                0,
-            ),
-        )
-        if download_filename:
+        await insert_multi_values(cursor, insert_query, "(?, ?, ?, ?, ?, ?, ?, 0, CURRENT_TIMESTAMP)", rows)
+        if filenames := [(filename, domain, url_path) for _, url_path, *_, filename, _ in rows if filename]:
             query = "UPDATE media SET download_filename = ? WHERE domain = ? and url_path = ?"
-            await cursor.execute(query, (download_filename, domain, url_path))
+            await cursor.executemany(query, filenames)
         await self.db_conn.commit()
 
     async def mark_complete(self, domain: str, media_item: MediaItem) -> None:
@@ -121,9 +155,9 @@ class HistoryTable(Table, name="media"):
         await self.db_conn.execute(query, (domain, media_item.db_path))
         await self.db_conn.commit()
 
-    async def add_filesize(self, domain: str, media_item: MediaItem) -> None:
+    async def add_filesize(self, domain: str, media_item: MediaItem, *, size: int | None = None) -> None:
         url_path = media_item.db_path
-        file_size = media_item.path.stat().st_size
+        file_size = size if size is not None else await aio.get_size(media_item.path)
         query = """UPDATE media SET file_size=? WHERE domain = ? and url_path = ?"""
         await self.db_conn.execute(query, (file_size, domain, url_path))
         await self.db_conn.commit()
@@ -139,7 +173,7 @@ class HistoryTable(Table, name="media"):
 
         url_path = media_item.db_path
         query = "SELECT duration FROM media WHERE domain = ? and url_path = ? LIMIT 1"
-        cursor = await self.db_conn.execute(query, (domain, url_path))
+        cursor = await self.reader.execute(query, (domain, url_path))
         if row := await cursor.fetchone():
             return row["duration"]
 
@@ -151,7 +185,7 @@ class HistoryTable(Table, name="media"):
 
     async def check_filename_exists(self, filename: str) -> bool:
         query = "SELECT 1 FROM media WHERE download_filename = ? LIMIT 1"
-        cursor = await self.db_conn.execute(query, (filename,))
+        cursor = await self.reader.execute(query, (filename,))
         return await cursor.fetchone() is not None
 
     async def get_downloaded_filename(self, domain: str, media_item: MediaItem) -> str | None:
@@ -162,11 +196,27 @@ class HistoryTable(Table, name="media"):
 
         url_path = media_item.db_path
         query = "SELECT download_filename FROM media WHERE domain = ? and url_path = ? LIMIT 1"
-        cursor = await self.db_conn.execute(query, (domain, url_path))
+        cursor = await self.reader.execute(query, (domain, url_path))
         if row := await cursor.fetchone():
             return row["download_filename"]
 
 
+async def _claim_no_crawler_rows(cursor: aiosqlite.Cursor, params: list[tuple[str, str | None, str, str]]) -> None:
+    """Assigns the real domain to rows previously inserted without a crawler (ex: from a retry)"""
+    query = "UPDATE media SET domain = ?, album_id = ? WHERE domain = 'no_crawler' and url_path = ? and referer = ?"
+    try:
+        await cursor.executemany(query, params)
+    except IntegrityError:
+        if len(params) > 1:
+            # Retry row by row so only the conflicting ones get deleted
+            for row in params:
+                await _claim_no_crawler_rows(cursor, [row])
+            return
+
+        delete_query = "DELETE FROM media WHERE domain = 'no_crawler' and url_path = ?"
+        await cursor.execute(delete_query, (params[0][2],))
+
+
 async def apply_fixes(db_conn: aiosqlite.Connection) -> None:
     await _fix_domains(db_conn)
     await _fix_referers(db_conn)
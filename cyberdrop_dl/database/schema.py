@@ -12,6 +12,8 @@ from .common import Table
 from .definitions import CREATE_SCHEMA
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     import aiosqlite
 
 
@@ -32,7 +34,7 @@ class Version(NamedTuple):
         return ".".join(map(str, self))
 
 
-CURRENT_VERSION = Version(10, 0, 0)
+CURRENT_VERSION = Version(10, 1, 0)
 REQUIRED_VERSION = Version(9, 15, 0)
 
 logger = logging.getLogger(__name__)
@@ -55,8 +57,9 @@ class SchemaTable(Table, name="schema_version"):
         logger.info(f"Expected database schema: {CURRENT_VERSION!s}")
         self.version = await self.get_version()
         logger.info(f"Current database schema: {self.version!s}")
-        await self.db_conn.execute(CREATE_SCHEMA)
-        await self.db_conn.commit()
+        if self.version is None:
+            await self.db_conn.execute(CREATE_SCHEMA)
+            await self.db_conn.commit()
 
     def check_version(self) -> None:
         error = None
@@ -85,10 +88,14 @@ class SchemaTable(Table, name="schema_version"):
 async def dump(db_conn: aiosqlite.Connection) -> str:
     query = "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY name"
     rows = await db_conn.execute_fetchall(query)
+    return _join_statements(row["sql"] for row in rows)
+
+
+def _join_statements(queries: Iterable[str]) -> str:
     index_queries: list[str] = []
     table_queries: list[str] = []
 
-    for query in (row["sql"] for row in rows):
+    for query in queries:
         group = table_queries if "CREATE TABLE" in query else index_queries
         group.append(query)
 
@@ -142,3 +149,13 @@ CREATE INDEX idx_media_domain_url_path_referer
 CREATE INDEX idx_media_referer_completed
     ON media (referer, completed);
 """.strip()
+
+# v10.1.0 adds the created_at index used by retry queries. Tables are the same as v9.15.0
+V10_1_0 = _join_statements(
+    [
+        *V9_15_0.removesuffix(";").split(";\n"),
+        "CREATE INDEX idx_media_created_at\n    ON media (created_at)",
+    ]
+)
+
+CURRENT_SCHEMA = V10_1_0
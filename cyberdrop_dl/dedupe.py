@@ -4,6 +4,7 @@ import asyncio
 import dataclasses
 import itertools
 import logging
+from collections import defaultdict
 from pathlib import Path
 from typing import TYPE_CHECKING, Self
 
@@ -51,17 +52,16 @@ class Czkawka:
             await self._dedupe(file_hashes)
 
     async def _dedupe(self, file_hashes: FileHashes) -> None:
-        async with asyncio.TaskGroup() as tg:
-
-            async def delete_dupes(hash_value: str, size: int) -> None:
-                db_matches = await self.database.hash.get_files_with_hash_matches(hash_value, size, "xxh128")
-                for file in _filter_db_matches(db_matches, self.base_dir):
-                    await self._sem.acquire()
-                    tg.create_task(self._delete_and_log(file, hash_value))
+        db_matches: dict[tuple[str, int], list[sqlite3.Row]] = defaultdict(list)
+        for row in await self.database.hash.get_files_with_hash_matches_many(file_hashes, "xxh128"):
+            db_matches[row["hash"], row["file_size"]].append(row)
 
+        async with asyncio.TaskGroup() as tg:
             for hash_value, sizes in file_hashes.items():
                 for size in sizes:
-                    tg.create_task(delete_dupes(hash_value, size))
+                    for file in _filter_db_matches(db_matches.get((hash_value, size), ()), self.base_dir):
+                        await self._sem.acquire()
+                        tg.create_task(self._delete_and_log(file, hash_value))
 
     async def _delete_and_log(self, file: Path, xxh128_value: str) -> None:
         hash_string = f"xxh128:{xxh128_value}"
@@ -37,6 +37,10 @@ class Streams(NamedTuple):
     subs: Path | None
 
 
+class _SegmentFailedError(Exception):
+    pass
+
+
 class HLSSegment(NamedTuple):
     idx: int
     name: str
@@ -75,8 +79,8 @@ def _create_media_segments(
             parents=media_item.parents,
             uploaded_at=media_item.uploaded_at,
             is_segment=True,
+            headers=media_item.headers.copy(),
         )
-        seg_media_item.headers = media_item.headers.copy()
         yield seg_media_item
 
 
@@ -110,7 +114,9 @@ async def _download_m3u8(
         download_folder=temp_dir / m3u8.media_type,
     )
 
-    logger.debug(f"Starting HLS download ({m3u8.media_type}, {len(segments):,} segments) for {media_item.real_url}")
+    logger.debug(
+        "Starting HLS download (%s, %s segments) for %s", m3u8.media_type, f"{len(segments):,}", media_item.real_url
+    )
     results = await _download_segments(m_segments, m3u8.total_segments, download, sem)
     await _merge_segments(tuple(result.item.path for result in results), output)
     return output
@@ -122,18 +128,22 @@ async def _download_segments(
     download: Callable[[MediaItem], Awaitable[SegmentDownloadResult]],
     sem: asyncio.BoundedSemaphore,
 ) -> list[SegmentDownloadResult]:
-    results = await aio.map(
-        download,
-        segments,
-        task_limit=sem,
-    )
+    """Downloads every segment concurrently. The first failed segment cancels the rest of the batch"""
+    n_successful = 0
 
-    n_successful = sum(1 for result in results if result.downloaded)
-    if n_successful != count:
-        msg = f"Download of some segments failed. Successful: {n_successful:,}/{count:,} "
-        raise DownloadError("HLS Seg Error", msg)
+    async def download_or_fail(segment: MediaItem) -> SegmentDownloadResult:
+        nonlocal n_successful
+        result = await download(segment)
+        if not result.downloaded:
+            raise _SegmentFailedError
+        n_successful += 1
+        return result
 
-    return results
+    try:
+        return await aio.map(download_or_fail, segments, task_limit=sem)
+    except* _SegmentFailedError:
+        msg = f"Download of some segments failed. Successful: {n_successful:,}/{count:,} "
+        raise DownloadError("HLS Seg Error", msg) from None
 
 
 async def _merge_segments(seg_paths: Sequence[Path], output: Path) -> None:
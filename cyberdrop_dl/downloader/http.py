@@ -5,6 +5,7 @@ import contextlib
 import dataclasses
 import logging
 import os
+import random
 from typing import TYPE_CHECKING
 
 from aiohttp import ClientConnectorError, ClientError, ClientResponseError
@@ -27,6 +28,7 @@ from cyberdrop_dl.utils.errors import error_handling_wrapper
 if TYPE_CHECKING:
     import datetime
     from collections.abc import AsyncGenerator
+    from pathlib import Path
 
     from cyberdrop_dl.clients.downloads import DownloadClient
     from cyberdrop_dl.config import Config
@@ -48,18 +50,28 @@ _KNOWN_BAD_URLS = {
 
 
 _GENERIC_CRAWLERS = ".", "no_crawler"
+_RETRY_BASE_DELAY: float = 1  # seconds
+_RETRY_MAX_DELAY: float = 30  # seconds
 _FILE_LOCKS: aio.WeakAsyncLocks[str] = aio.WeakAsyncLocks()
 _NULL_CONTEXT: contextlib.nullcontext[None] = contextlib.nullcontext()
+# On Windows, chmod can only toggle the read-only flag, which is never set on our own files
+_NEEDS_CHMOD: bool = os.name != "nt"
 
 
 @contextlib.asynccontextmanager
 async def _exclusive_lock(media_item: MediaItem) -> AsyncGenerator[None]:
     async with _FILE_LOCKS[media_item.filename]:
-        logger.debug(f"Lock for '{media_item.filename}' acquired")
+        logger.debug("Lock for '%s' acquired", media_item.filename)
         try:
             yield
         finally:
-            logger.debug(f"Lock for '{media_item.filename}' released")
+            logger.debug("Lock for '%s' released", media_item.filename)
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so retries do not hammer a server that is already failing"""
+    delay = _RETRY_BASE_DELAY * 2 ** (attempt - 1) * (1 + random.random() * 0.5)
+    return min(_RETRY_MAX_DELAY, delay)
 
 
 @dataclasses.dataclass(slots=True)
@@ -106,9 +118,11 @@ class Downloader:
     log_prefix: str = "Download"
     use_server_lock: bool = False
     max_attempts: int = dataclasses.field(init=False)
+    needs_duration: bool = dataclasses.field(init=False)
 
     _slots: int | None = None
     _processed_items: set[str] = dataclasses.field(init=False, default_factory=set)
+    _in_flight: set[str] = dataclasses.field(init=False, default_factory=set)
     _current_attempt_filesize: dict[str, int] = dataclasses.field(init=False, default_factory=dict)
     _semaphore: asyncio.Semaphore = dataclasses.field(init=False)
     _server_locks: aio.WeakAsyncLocks[str] = dataclasses.field(
@@ -119,6 +133,7 @@ class Downloader:
     def __post_init__(self) -> None:
         self.slots = self._slots
         self.max_attempts = self.config.downloads.attempts
+        self.needs_duration = self.config.filters.duration.needs_ffmpeg
 
     @property
     def waiting_items(self) -> int:
@@ -157,38 +172,57 @@ class Downloader:
 
     @error_handling_wrapper
     async def __download_w_retries(self, media_item: MediaItem) -> bool:
-        while True:
-            try:
-                return bool(await self.__download_file(media_item))
-
-            except DownloadError as e:
-                if not e.retry:
-                    raise
-
-                logger.error(f"{self.log_prefix} failed: {media_item.url} with error: {e!s}")
-                if media_item.attempts >= self.max_attempts:
-                    raise
-
-                logger.info(
-                    f"Retrying {self.log_prefix.lower()}: {media_item.url}, retry attempt: {media_item.attempts + 1}"
-                )
+        # The file lock is held until we give up, so no other item can write to the same .part file between attempts
+        async with _exclusive_lock(media_item):
+            while True:
+                try:
+                    # The slot is taken per attempt, so it is free for others while we wait to retry
+                    async with self.__download_slot(media_item):
+                        return bool(await self.__download_file(media_item))
+
+                except DownloadError as e:
+                    if not e.retry:
+                        raise
+
+                    logger.error(f"{self.log_prefix} failed: {media_item.url} with error: {e!s}")
+                    if media_item.attempts >= self.max_attempts:
+                        raise
+
+                    delay = _retry_delay(media_item.attempts)
+                    logger.info(
+                        f"Retrying {self.log_prefix.lower()}: {media_item.url}, retry attempt: {media_item.attempts + 1} "
+                        f"(in {delay:.1f} seconds)"
+                    )
+                    await asyncio.sleep(delay)
 
     async def __finalize_download(self, media_item: MediaItem) -> None:
-        await aio.chmod(media_item.path, 0o666)
         if media_item.is_segment:
+            if _NEEDS_CHMOD:
+                await aio.chmod(media_item.path, 0o666)
             return
-        await _set_mtime(media_item, self.config)
+
+        mtime = None
+        if self.config.mtime:
+            mtime = await _set_creation_time(media_item)
+        if _NEEDS_CHMOD or mtime is not None:
+            await asyncio.to_thread(_set_permissions_and_mtime, media_item.path, mtime)
         self.manager.scrape_mapper.tui.files.stats.completed += 1
         logger.info(f"Download finished: {media_item.url}")
 
+    async def _load_duration(self, media_item: MediaItem) -> None:
+        """Loads the duration saved in the database, only if a duration filter needs it"""
+        if self.needs_duration:
+            media_item.duration = await self.manager.database.history.get_duration(media_item.domain, media_item)
+
     async def _check_skip_by_config(self, media_item: MediaItem) -> None:
-        if not _is_allowed_filetype(media_item, self.config):
+        config = self.config
+        if not _is_allowed_filetype(media_item, config):
             raise RestrictedFiletypeError(origin=media_item)
-        if not _is_allowed_date_range(media_item, self.config):
+        if not _is_allowed_date_range(media_item, config):
             raise RestrictedDateRangeError(origin=media_item)
         if not await storage.has_sufficient_space(media_item.download_folder):
             raise InsufficientFreeSpaceError(media_item)
-        if await filter_by_duration(media_item, self.config):
+        if await filter_by_duration(media_item, config):
             await self.manager.database.history.add_duration(media_item.domain, media_item)
             raise DurationError(origin=media_item)
 
@@ -196,12 +230,11 @@ class Downloader:
         if not media_item.is_segment:
             logger.info(f"{self.log_prefix} starting: {media_item.url}")
 
-        async with _exclusive_lock(media_item):
-            return bool(await self.__download_w_retries(media_item))
+        return bool(await self.__download_w_retries(media_item))
 
     @contextlib.asynccontextmanager
-    async def __download_context(self, media_item: MediaItem) -> AsyncGenerator[None]:
-        await self.client.mark_incomplete(media_item, media_item.domain)
+    async def __download_slot(self, media_item: MediaItem) -> AsyncGenerator[None]:
+        """Waits for a free download slot. Segments use the slot of their parent HLS download"""
         if media_item.is_segment:
             yield
             return
@@ -218,7 +251,7 @@ class Downloader:
         media_item.attempts += 1
         try:
             if not media_item.is_segment:
-                media_item.duration = await self.manager.database.history.get_duration(media_item.domain, media_item)
+                await self._load_duration(media_item)
                 await self._check_skip_by_config(media_item)
             downloaded = await self.client.download_file(media_item.domain, media_item)
 
@@ -263,21 +296,37 @@ class Downloader:
         ):
             yield
 
+    def _is_duplicate(self, media_item: MediaItem) -> bool:
+        """Checks if the item was already processed or is queued, before any DB write or limiter wait"""
+        if self._ignore_history:
+            return False
+        db_path = media_item.db_path
+        return db_path in self._processed_items or db_path in self._in_flight
+
     async def run(self, media_item: MediaItem) -> bool:
-        if media_item.url.path in self._processed_items and not self._ignore_history:
+        if self._is_duplicate(media_item):
             return False
 
-        async with self.__download_context(media_item):
+        self._in_flight.add(media_item.db_path)
+        try:
+            await self.client.mark_incomplete(media_item, media_item.domain)
             return await self._download(media_item)
+        finally:
+            self._in_flight.discard(media_item.db_path)
 
     @error_handling_wrapper
     async def download_hls(self, media_item: MediaItem, m3u8_group: Rendition) -> None:
-        if media_item.url.path in self._processed_items and not self._ignore_history:
+        if self._is_duplicate(media_item):
             return
 
         assert ffmpeg.is_installed()
-        async with self.__download_context(media_item):
-            await self.__hls_download(media_item, m3u8_group)
+        self._in_flight.add(media_item.db_path)
+        try:
+            await self.client.mark_incomplete(media_item, media_item.domain)
+            async with self.__download_slot(media_item):
+                await self.__hls_download(media_item, m3u8_group)
+        finally:
+            self._in_flight.discard(media_item.db_path)
 
     async def __hls_download(self, media_item: MediaItem, rendition: Rendition) -> None:
         media_item.path = media_item.download_folder / media_item.filename
@@ -301,13 +350,13 @@ class Downloader:
             # TODO: add remux method to ffmpeg to create an mkv file instead of mp4
             # Subtitles format may be incompatible with mp4 and they will be silently dropped by ffmpeg
             # so we leave them as independent files for now
-            logger.debug(f"Merging audio and video stream from {media_item.real_url}")
+            logger.debug("Merging audio and video stream from %s", media_item.real_url)
             ffmpeg_result = await ffmpeg.merge((streams.video, streams.audio), media_item.path)
 
             if not ffmpeg_result.success:
                 raise DownloadError("FFmpeg Concat Error", ffmpeg_result.stderr, media_item)
 
-        logger.debug(f"Running MP4 fixup ({media_item.real_url})")
+        logger.debug("Running MP4 fixup (%s)", media_item.real_url)
         ffmpeg_result = await ffmpeg.fixup_video(media_item.path)
         if not ffmpeg_result.success:
             raise DownloadError("FFmpeg Fixup Error", ffmpeg_result.stderr, media_item)
@@ -319,15 +368,12 @@ class Downloader:
 def _is_allowed_filetype(media_item: MediaItem, config: Config) -> bool:
     filters = config.filters.files
     ext = media_item.ext.lower()
-
-    for is_allowed, valid_exts in [
-        (filters.images, constants.FileExt.IMAGE),
-        (filters.videos, constants.FileExt.VIDEO),
-        (filters.audio, constants.FileExt.AUDIO),
-    ]:
-        if ext in valid_exts:
-            return is_allowed
-
+    if ext in constants.FileExt.IMAGE:
+        return filters.images
+    if ext in constants.FileExt.VIDEO:
+        return filters.videos
+    if ext in constants.FileExt.AUDIO:
+        return filters.audio
     return filters.non_media
 
 
@@ -347,23 +393,24 @@ def _filter_by_date(item_datetime: datetime.datetime, config: Config) -> bool:
     return not (filters.after and item_date < filters.after)
 
 
-async def _set_mtime(media_item: MediaItem, config: Config) -> None:
-    if media_item.is_segment:
-        return
-
-    if not config.mtime:
-        return
-
+async def _set_creation_time(media_item: MediaItem) -> int | None:
+    """Sets the creation date of the file and returns the timestamp to use as its modification date"""
     if not media_item.uploaded_at:
         logger.warning(f"Unable to parse upload date for {media_item.url}, using current datetime as file datetime")
-        return
+        return None
 
-    # 1. try setting creation date
     await dates.set_creation_time(media_item.path, media_item.uploaded_at)
+    return media_item.uploaded_at
+
 
-    # 2. try setting modification and access date
+def _set_permissions_and_mtime(path: Path, mtime: int | None) -> None:
+    # Both in a single thread hop
+    if _NEEDS_CHMOD:
+        path.chmod(0o666)
+    if mtime is None:
+        return
     try:
-        await asyncio.to_thread(os.utime, media_item.path, (media_item.uploaded_at, media_item.uploaded_at))
+        os.utime(path, (mtime, mtime))
     except OSError:
         pass
 
@@ -9,16 +9,14 @@ import logging
 import shutil
 import subprocess
 import uuid
-from fractions import Fraction
 from typing import TYPE_CHECKING, Any, Literal, Self, TypedDict
 
 from multidict import CIMultiDict, CIMultiDictProxy
 
 from cyberdrop_dl import aio
-from cyberdrop_dl.utils.dataclass import DictDataclass
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
+    from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
     from pathlib import Path
 
     from cyberdrop_dl.url_objects import AbsoluteHttpURL
@@ -35,6 +33,7 @@ class Args:
     FIXUP_AUDIO_DTS_FILTER = "-bsf:a", "aac_adtstoasc"
 
 
+_DELETE_BATCH_SIZE = 64
 _FFMPEG_CALL_PREFIX = "ffmpeg", "-y", "-loglevel", "error"
 _FFPROBE_CALL_PREFIX = (
     "ffprobe",
@@ -78,6 +77,9 @@ def which_ffprobe() -> str | None:
     return shutil.which("ffprobe")
 
 
+_WHICH: dict[str | Path, Callable[[], str | None]] = {"ffmpeg": which_ffmpeg, "ffprobe": which_ffprobe}
+
+
 @functools.cache
 def version() -> str | None:
     if bin_path := which_ffmpeg():
@@ -93,7 +95,7 @@ def ffprobe_version() -> str | None:
 async def merge(input_files: Iterable[Path], output_file: Path) -> SubProcessResult:
     result = await _merge(input_files, output_file)
     if result.success:
-        await aio.gather(*map(_try_delete, input_files))
+        await _delete_files(input_files)
     return result
 
 
@@ -109,7 +111,7 @@ async def concat(input_files: Iterable[Path], output_file: Path) -> SubProcessRe
     try:
         result = await _concat(concat_file, output_file)
         if result.success:
-            await aio.gather(*map(_try_delete, input_files))
+            await _delete_files(input_files)
     finally:
         await _try_delete(concat_file)
 
@@ -139,11 +141,11 @@ async def _create_concat_file(input_files: Iterable[Path], output_file: Path) ->
 
 async def fixup_video(file: Path) -> SubProcessResult:
     temp_file = file.with_suffix(".fixup" + file.suffix)
-    command = *_FFMPEG_CALL_PREFIX, "-i", file, *Args.FIXUP_MP4
+    command: list[str | Path] = [*_FFMPEG_CALL_PREFIX, "-i", file, *Args.FIXUP_MP4]
     probe_result = await probe(file)
     if probe_result and (audio := probe_result.audio) and audio.codec == "aac":
-        command = *command, *Args.FIXUP_AUDIO_DTS_FILTER
-    command = *command, temp_file
+        command.extend(Args.FIXUP_AUDIO_DTS_FILTER)
+    command.append(temp_file)
     result = await _run_command(command)
     if result.success:
         await aio.unlink(file)
@@ -154,17 +156,32 @@ async def fixup_video(file: Path) -> SubProcessResult:
     return result
 
 
-async def _try_delete(file: Path) -> None:
+def _unlink_logged(file: Path) -> None:
     try:
-        await aio.unlink(file, missing_ok=True)
+        file.unlink(missing_ok=True)
     except OSError as e:
         logger.warning(f"Unable to delete '{file}' {e}")
 
 
+async def _try_delete(file: Path) -> None:
+    await asyncio.to_thread(_unlink_logged, file)
+
+
+async def _delete_files(files: Iterable[Path]) -> None:
+    """Deletes files in parallel batches. HLS downloads can have thousands of segments"""
+    batches = itertools.batched(files, _DELETE_BATCH_SIZE)
+    await aio.gather(*(asyncio.to_thread(_delete_batch, batch) for batch in batches))
+
+
+def _delete_batch(files: Iterable[Path]) -> None:
+    for file in files:
+        _unlink_logged(file)
+
+
 async def raw_concat(files: Iterable[Path], output: Path) -> None:
     logger.debug("Merging subs to '%s'", output)
     await asyncio.to_thread(_raw_concat, files, output)
-    await aio.gather(*map(_try_delete, files))
+    await _delete_files(files)
 
 
 def _raw_concat(files: Iterable[Path], output: Path) -> None:
@@ -205,7 +222,7 @@ async def probe_url(
 
 async def _probe(command: Sequence[str | Path]) -> FFprobeResult:
     _check_ffprobe()
-    result = await _run_command(command)
+    result = await _run_command(command, decode_stdout=False)
     if not result.success:
         return _EMPTY_FFPROBE_RESULT
     return FFprobeResult.from_output(json.loads(result.stdout))
@@ -260,13 +277,41 @@ class FFprobeOutput(TypedDict):
 class Tags(CIMultiDictProxy[Any]): ...
 
 
+_EMPTY_TAGS: Tags = Tags(CIMultiDict())  # Proxies are read only, so it can be shared
+
+
 class TruncatedFloat(float):
     def __str__(self) -> str:
         return str(int(self)) if self.is_integer() else f"{self:.2f}"
 
 
+def _parse_tags(info: Mapping[str, Any]) -> Tags:
+    if tags := info.get("tags"):
+        return Tags(CIMultiDict(tags))
+    return _EMPTY_TAGS
+
+
+def _parse_bitrate(info: Mapping[str, Any]) -> int | None:
+    return int(info.get("bitrate") or info.get("bit_rate") or 0) or None
+
+
+def _parse_fps(avg_frame_rate: str | float | None) -> TruncatedFloat | None:
+    # ffprobe reports it as a fraction (ex: "30000/1001") or "0/0" if unknown
+    if not avg_frame_rate:
+        return None
+    num, _, den = str(avg_frame_rate).partition("/")
+    denominator = float(den or 1)
+    if not denominator or not (fps := float(num) / denominator):
+        return None
+    return TruncatedFloat(fps)
+
+
+def _parse_positive_int(value: Any) -> int | None:
+    return int(float(value or 0)) or None
+
+
 @dataclasses.dataclass(slots=True, kw_only=True)
-class Stream(DictDataclass):
+class Stream:
     index: int
     codec: str
     codec_type: str
@@ -275,19 +320,18 @@ class Stream(DictDataclass):
     tags: Tags
 
     @classmethod
-    def validate(cls, stream_info: Mapping[str, Any]) -> dict[str, Any]:
-        info = cls.filter_dict(stream_info)
-        tags = Tags(CIMultiDict(stream_info.get("tags", {})))
-        return info | {
-            "codec": stream_info.get("codec_name"),
-            "duration": _parse_duration(stream_info.get("duration") or tags.get("duration")),
-            "bitrate": int(stream_info.get("bitrate") or stream_info.get("bit_rate") or 0) or None,
-            "tags": tags,
-        }
-
-    @classmethod
-    def from_dict(cls, data: Mapping[str, Any], /, **overrides: Any) -> Self:
-        return super(Stream, cls).from_dict(cls.validate(data), **overrides)
+    def from_dict(cls, stream_info: Mapping[str, Any], /, **extra: Any) -> Self:
+        """Parses the fields common to every stream. Subclasses pass their own fields as `extra`"""
+        tags = _parse_tags(stream_info)
+        return cls(
+            index=stream_info["index"],
+            codec=stream_info.get("codec_name"),  # pyright: ignore[reportArgumentType]
+            codec_type=stream_info["codec_type"],
+            bitrate=_parse_bitrate(stream_info),
+            duration=_parse_duration(stream_info.get("duration") or tags.get("duration")),
+            tags=tags,
+            **extra,
+        )
 
 
 @dataclasses.dataclass(slots=True, kw_only=True)
@@ -296,10 +340,9 @@ class AudioStream(Stream):
     codec_type: Literal["audio"] = "audio"  # pyright: ignore[reportIncompatibleVariableOverride]
 
     @classmethod
-    def validate(cls, stream_info: Mapping[str, Any]) -> dict[str, Any]:
-        defaults = super(AudioStream, cls).validate(stream_info)
-        sample_rate = int(float(stream_info.get("sample_rate", 0))) or None
-        return defaults | {"sample_rate": sample_rate}
+    def from_dict(cls, stream_info: Mapping[str, Any], /, **extra: Any) -> Self:
+        sample_rate = _parse_positive_int(stream_info.get("sample_rate"))
+        return super(AudioStream, cls).from_dict(stream_info, sample_rate=sample_rate, **extra)
 
 
 @dataclasses.dataclass(slots=True, kw_only=True)
@@ -311,18 +354,17 @@ class VideoStream(Stream):
     codec_type: Literal["video"] = "video"  # pyright: ignore[reportIncompatibleVariableOverride]
 
     @classmethod
-    def validate(cls, stream_info: Mapping[str, Any]) -> dict[str, Any]:
-        width = int(float(stream_info.get("width", 0))) or None
-        height = int(float(stream_info.get("height", 0))) or None
-        resolution = fps = None
-        if width and height:
-            resolution: str | None = f"{width}x{height}"
-
-        if (avg_fps := stream_info.get("avg_frame_rate")) and str(avg_fps) not in {"0/0", "0", "0.0"}:
-            fps: TruncatedFloat | None = TruncatedFloat(Fraction(avg_fps))
-
-        defaults = super(VideoStream, cls).validate(stream_info)
-        return defaults | {"width": width, "height": height, "fps": fps, "resolution": resolution}
+    def from_dict(cls, stream_info: Mapping[str, Any], /, **extra: Any) -> Self:
+        width = _parse_positive_int(stream_info.get("width"))
+        height = _parse_positive_int(stream_info.get("height"))
+        return super(VideoStream, cls).from_dict(
+            stream_info,
+            width=width,
+            height=height,
+            fps=_parse_fps(stream_info.get("avg_frame_rate")),
+            resolution=f"{width}x{height}" if width and height else None,
+            **extra,
+        )
 
 
 @dataclasses.dataclass(slots=True)
@@ -334,12 +376,12 @@ class Format:
 
     @classmethod
     def from_dict(cls, format_info: dict[str, Any]) -> Self:
-        tags = Tags(CIMultiDict(format_info.get("tags", {})))
+        tags = _parse_tags(format_info)
 
         return cls(
-            size=int(float(format_info.get("size") or 0)) or None,
+            size=_parse_positive_int(format_info.get("size")),
             duration=_parse_duration(format_info.get("duration") or tags.get("duration")),
-            bitrate=int(format_info.get("bitrate") or format_info.get("bit_rate") or 0) or None,
+            bitrate=_parse_bitrate(format_info),
             tags=tags,
         )
 
@@ -402,7 +444,8 @@ _EMPTY_FFPROBE_RESULT: FFprobeResult = FFprobeResult.from_output({"streams": []}
 @dataclasses.dataclass(slots=True)
 class SubProcessResult:
     return_code: int | None
-    stdout: str
+    stdout: str | bytes
+    """Raw bytes if the output was going to be parsed as JSON"""
     stderr: str
 
     @property
@@ -413,8 +456,9 @@ class SubProcessResult:
         me = dataclasses.asdict(self)
         try:
             stdout = json.loads(self.stdout)
-        except json.JSONDecodeError:
-            pass
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            if isinstance(self.stdout, bytes):
+                me["stdout"] = self.stdout.decode("utf-8", errors="ignore")
         else:
             me["stdout"] = stdout
         return me
@@ -423,26 +467,27 @@ class SubProcessResult:
         return str(self.__json__())
 
 
-async def _run_command(command: Sequence[str | Path]) -> SubProcessResult:
+async def _run_command(command: Sequence[str | Path], *, decode_stdout: bool = True) -> SubProcessResult:
     assert not isinstance(command, str)
     program, *cmd = command
 
-    if program == "ffmpeg":
-        bin_path = which_ffmpeg()
-    elif program == "ffprobe":
-        bin_path = which_ffprobe()
-    else:
-        raise ValueError(f"Unexpected program in command {command}")
+    try:
+        bin_path = _WHICH[program]()
+    except KeyError:
+        raise ValueError(f"Unexpected program in command {command}") from None
 
     assert bin_path
-    process_id = str(uuid.uuid4())
-    logger.debug("Running %s subprocess [id=%s]:\n%s", program, process_id, {"command": [bin_path, *map(str, cmd)]})
-    process = await asyncio.create_subprocess_exec(bin_path, *cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    args = tuple(map(str, cmd))
+    if debug := logger.isEnabledFor(logging.DEBUG):
+        process_id = str(uuid.uuid4())
+        logger.debug("Running %s subprocess [id=%s]:\n%s", program, process_id, {"command": [bin_path, *args]})
+    process = await asyncio.create_subprocess_exec(bin_path, *args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     stdout, stderr = await process.communicate()
     result = SubProcessResult(
-        stdout=stdout.decode("utf-8", errors="ignore"),
+        stdout=stdout.decode("utf-8", errors="ignore") if decode_stdout else stdout,
         stderr=stderr.decode("utf-8", errors="ignore"),
         return_code=process.returncode,
     )
-    logger.debug("%s subprocess [id=%s] output:\n%s", program, process_id, result)
+    if debug:
+        logger.debug("%s subprocess [id=%s] output:\n%s", program, process_id, result)  # pyright: ignore[reportPossiblyUnboundVariable]
     return result
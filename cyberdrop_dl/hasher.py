@@ -4,7 +4,10 @@ import asyncio
 import dataclasses
 import hashlib
 import logging
+import os
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Final, Literal, Self
 
@@ -22,6 +25,7 @@ if TYPE_CHECKING:
     from cyberdrop_dl.url_objects import AbsoluteHttpURL, MediaItem
 
 FileHashes = dict[str, dict[int, set[Path]]]
+HashAlgorithm = Literal["xxh128", "md5", "sha256"]
 
 _HASHERS: Final = {
     "md5": hashlib.md5,
@@ -29,31 +33,67 @@ _HASHERS: Final = {
     "sha256": hashlib.sha256,
 }
 _CHUNK_SIZE: Final = 1024 * 1024  # 1MB
+_HAS_FADVISE: Final = hasattr(os, "posix_fadvise")
+_MAX_WORKERS: Final = os.cpu_count() or 4
 
 
 logger = logging.getLogger(__name__)
+_thread_local = threading.local()
 
 
-def _compute_hash(file: Path, algorithm: Literal["xxh128", "md5", "sha256"]) -> str:
+def _get_read_buffer() -> memoryview:
+    """Returns a read buffer owned by the current thread, allocated once per worker thread"""
+    try:
+        return _thread_local.buffer
+    except AttributeError:
+        buffer = _thread_local.buffer = memoryview(bytearray(_CHUNK_SIZE))
+        return buffer
+
+
+def _compute_hashes(file: Path, algorithms: Iterable[HashAlgorithm]) -> dict[str, str]:
+    """Computes every hash of the file with a single read pass"""
+    hashers = {algo: _HASHERS[algo]() for algo in algorithms}
+    updates = [hasher.update for hasher in hashers.values()]
     with file.open("rb") as fp:
-        hasher = _HASHERS[algorithm]()
-        buffer = bytearray(_CHUNK_SIZE)
-        mem_view = memoryview(buffer)
-        while size := fp.readinto(buffer):
-            hasher.update(mem_view[:size])
+        if _HAS_FADVISE:
+            os.posix_fadvise(fp.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        mem_view = _get_read_buffer()
+        while size := fp.readinto(mem_view):
+            chunk = mem_view[:size]
+            for update in updates:
+                update(chunk)
+
+    return {algo: hasher.hexdigest() for algo, hasher in hashers.items()}
+
 
-    return hasher.hexdigest()
+def _compute_hash(file: Path, algorithm: HashAlgorithm) -> str:
+    return _compute_hashes(file, (algorithm,))[algorithm]
 
 
 async def hash_directory(hasher: Hasher) -> HashingStats:
     if not await aio.is_dir(hasher.path):
         raise NotADirectoryError(None, hasher.path)
 
-    async with hasher.database:
-        with hasher.tui():
-            async with asyncio.TaskGroup() as tg:
-                async for file in aio.rglob(hasher.path, "*"):
-                    _ = tg.create_task(hasher.update_db_and_retrive_hash(file))
+    # A small bounded queue lets the directory walk stay just ahead of the workers
+    # without creating a task for every file in the tree
+    queue: asyncio.Queue[Path | None] = asyncio.Queue(maxsize=_MAX_WORKERS * 2)
+
+    async def worker() -> None:
+        while (file := await queue.get()) is not None:
+            _ = await hasher.update_db_and_retrive_hash(file)
+
+    try:
+        async with hasher.database:
+            with hasher.tui():
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(_MAX_WORKERS):
+                        _ = tg.create_task(worker())
+                    async for file in aio.rglob(hasher.path, "*"):
+                        await queue.put(file)
+                    for _ in range(_MAX_WORKERS):
+                        await queue.put(None)
+    finally:
+        hasher.close()
 
     return hasher.stats
 
@@ -64,6 +104,7 @@ class Hasher:
     database: Database
     path: Path
     tui: HashingUI = dataclasses.field(init=False, repr=False)
+    algorithms: tuple[HashAlgorithm, ...] = dataclasses.field(init=False)
 
     _cwd: Path = dataclasses.field(init=False, default_factory=Path.cwd)
     _hashes_map: FileHashes = dataclasses.field(
@@ -76,6 +117,7 @@ class Hasher:
         repr=False,
         default_factory=lambda: asyncio.BoundedSemaphore(20),
     )
+    _pool: ThreadPoolExecutor | None = dataclasses.field(init=False, repr=False, default=None)
     _hashed_items: set[tuple[str, ...]] = dataclasses.field(
         init=False,
         repr=False,
@@ -84,6 +126,7 @@ class Hasher:
 
     def __post_init__(self) -> None:
         self.tui = HashingUI(self.path)
+        self.algorithms = ("xxh128", *self.extra_hashes)
 
     @classmethod
     def create(cls, config: Config, db: Database, path: Path | None = None) -> Self:
@@ -97,9 +140,27 @@ class Hasher:
     def stats(self) -> HashingStats:
         return self.tui.stats
 
-    async def hash_file(self, filename: Path | str, hash_type: Literal["xxh128", "md5", "sha256"]) -> str:
+    @property
+    def _executor(self) -> ThreadPoolExecutor:
+        # Hashing is CPU bound. A dedicated pool keeps it from oversubscribing cores
+        # and from starving the default executor used by every other file operation
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="cdl-hash")
+        return self._pool
+
+    def close(self) -> None:
+        """Shuts down the hashing threads. A new pool is created if the hasher is used again"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def hash_file(self, filename: Path | str, hash_type: HashAlgorithm) -> str:
+        file_path = self._cwd / filename
+        return await asyncio.get_running_loop().run_in_executor(self._executor, _compute_hash, file_path, hash_type)
+
+    async def hash_file_many(self, filename: Path | str, hash_types: Iterable[HashAlgorithm]) -> dict[str, str]:
         file_path = self._cwd / filename
-        return await asyncio.to_thread(_compute_hash, file_path, hash_type)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, _compute_hashes, file_path, hash_types)
 
     async def hash_item(self, media_item: MediaItem) -> None:
         if media_item.is_segment:
@@ -128,53 +189,39 @@ class Hasher:
         except IsADirectoryError:
             return None
 
-        def compute_hash(algo: Literal["xxh128", "md5", "sha256"]) -> asyncio.Task[str | None]:
-            return tg.create_task(self._update_db_and_retrive_hash(file, original_filename, referer, algo))
-
         async with self._sem:
             with self.tui.new_file(file):
-                async with asyncio.TaskGroup() as tg:
-                    logger.info("Computing hashes of '%s'", file)
-                    xxxhash = compute_hash("xxh128")
-                    for algo in self.extra_hashes:
-                        _ = compute_hash(algo)
+                logger.info("Computing hashes of '%s'", file)
+                hashes = await self._retrive_hashes(file, self.algorithms)
+                if not hashes:
+                    return None
 
-        return xxxhash.result()
+                try:
+                    await self.database.hash.insert_or_update_file_hashes(hashes, file, original_filename, referer)
+                except Exception:
+                    logger.exception("Error saving hashes of '%s'", file)
+                    return None
 
-    async def _update_db_and_retrive_hash(
-        self,
-        file: Path,
-        original_filename: str | None,
-        referer: AbsoluteHttpURL | None,
-        hash_type: Literal["xxh128", "md5", "sha256"],
-    ) -> str | None:
-        """Generates hash of a file."""
+        return hashes.get("xxh128")
+
+    async def _retrive_hashes(self, file: Path, hash_types: tuple[HashAlgorithm, ...]) -> dict[str, str]:
+        """Returns the hashes of a file from the database.
+
+        Hashes that are not in the database are all computed together, reading the file only once"""
 
-        hash_value = await self.database.hash.get_file_hash_exists(file, hash_type)
+        hashes: dict[str, str] = {}
         try:
-            if not hash_value:
-                hash_value = await self.hash_file(file, hash_type)
-                await self.database.hash.insert_or_update_hash_db(
-                    hash_value,
-                    hash_type,
-                    file,
-                    original_filename,
-                    referer,
-                )
-                self.tui.add_completed(hash_type)
-            else:
-                self.tui.stats.prev_hashed += 1
-                await self.database.hash.insert_or_update_hash_db(
-                    hash_value,
-                    hash_type,
-                    file,
-                    original_filename,
-                    referer,
-                )
+            saved = await self.database.hash.get_file_hashes(file)
+            hashes.update((algo, hash_value) for algo in hash_types if (hash_value := saved.get(algo)))
+            self.tui.stats.prev_hashed += len(hashes)
+            missing: tuple[HashAlgorithm, ...] = tuple(algo for algo in hash_types if algo not in hashes)
+            if missing:
+                hashes.update(await self.hash_file_many(file, missing))
+                for algo in missing:
+                    self.tui.add_completed(algo)
         except Exception:
             logger.exception("Error hashing '%s'", file)
-        else:
-            return hash_value
+        return hashes
 
     async def save_hash_data(self, media_item: MediaItem, hash_value: str | None) -> None:
         if not hash_value:
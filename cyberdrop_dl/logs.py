@@ -3,12 +3,15 @@ from __future__ import annotations
 import contextlib
 import json
 import logging
+import os
 import queue
+import re
 import sys
+import threading
 from contextvars import ContextVar
 from enum import StrEnum
 from io import StringIO
-from logging.handlers import QueueHandler, QueueListener
+from logging.handlers import QueueHandler
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar, final, override
 
@@ -39,9 +42,11 @@ if not env.DEBUG_MODE:
 
 
 _USER_NAME = Path.home().name
+# Username as a path component: preceded or followed by any path separator
+_USER_NAME_REGEX = re.compile(rf"(?<=[\\/]){re.escape(_USER_NAME)}|{re.escape(_USER_NAME)}(?=[\\/])")
 _DEFAULT_CONSOLE_WIDTH = 240
-_MAIN_LOG_LISTENER: ContextVar[QueueListener] = ContextVar("_MAIN_LOG_LISTENER")
-_CONSOLE_LOG_LISTENER: ContextVar[QueueListener] = ContextVar("_CONSOLE_LOG_LISTENER")
+_MAIN_LOG_LISTENER: ContextVar[BatchedQueueListener] = ContextVar("_MAIN_LOG_LISTENER")
+_CONSOLE_LOG_LISTENER: ContextVar[BatchedQueueListener] = ContextVar("_CONSOLE_LOG_LISTENER")
 _LOG_TO_CONSOLE: ContextVar[bool] = ContextVar("LOG_TO_CONSOLE", default=True)
 
 
@@ -60,19 +65,26 @@ class RedactedConsole(Console):
 
     @classmethod
     def _redact_message(cls, message: object) -> str:
-        redacted = str(message)
-        for sep in ("\\", "\\\\", "/"):
-            as_tail = sep + _USER_NAME
-            as_part = _USER_NAME + sep
-            redacted = redacted.replace(as_tail, f"{sep}[REDACTED]").replace(as_part, f"[REDACTED]{sep}")
-        return redacted
+        message = str(message)
+        if not _USER_NAME or _USER_NAME not in message:
+            return message
+        return _USER_NAME_REGEX.sub("[REDACTED]", message)
 
 
 class JsonLogRecord(logging.LogRecord):
-    """`dicts` will be logged as json, lazily"""
+    """`dicts` will be logged as json, lazily.
+
+    The message is computed once and reused by every handler that formats the record"""
+
+    _cdl_message: str | None = None
 
     @override
     def getMessage(self) -> str:
+        if self._cdl_message is None:
+            self._cdl_message = self._get_message()
+        return self._cdl_message
+
+    def _get_message(self) -> str:
         msg = str(self._proccess_msg(self.msg))
         args = self.args
         if not args:
@@ -191,16 +203,68 @@ class BareQueueHandler(QueueHandler):
         return record
 
 
+class BatchedQueueListener:
+    """Handles log records from a queue in a background thread.
+
+    Like `logging.handlers.QueueListener`, but every record already waiting in the queue (up to a limit) is taken at once.
+    For rich handlers, the whole batch is rendered into the console buffer and written to the file at once"""
+
+    MAX_BATCH_SIZE: ClassVar[int] = 64
+
+    def __init__(
+        self,
+        q: queue.SimpleQueue[logging.LogRecord | None],
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+    ) -> None:
+        self.queue: queue.SimpleQueue[logging.LogRecord | None] = q
+        self.handlers: tuple[logging.Handler, ...] = handlers
+        self.respect_handler_level: bool = respect_handler_level
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = thread = threading.Thread(target=self._monitor, daemon=True)
+        thread.start()
+
+    def stop(self) -> None:
+        """Handles every record currently in the queue and stops the thread"""
+        self.queue.put_nowait(None)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _monitor(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            with contextlib.suppress(queue.Empty):
+                while batch[-1] is not None and len(batch) < self.MAX_BATCH_SIZE:
+                    batch.append(self.queue.get_nowait())
+
+            if records := [record for record in batch if record is not None]:
+                self.handle_batch(records)
+            if batch[-1] is None:
+                return
+
+    def handle_batch(self, records: list[logging.LogRecord]) -> None:
+        for handler in self.handlers:
+            # Rich only writes to the file when the outermost console context exits
+            buffered = handler.console if isinstance(handler, RichHandler) else contextlib.nullcontext()
+            with buffered:
+                for record in records:
+                    if not self.respect_handler_level or record.levelno >= handler.level:
+                        _ = handler.handle(record)
+
+
 @contextlib.contextmanager
 def _threaded_logger(
     log_handler: logging.Handler,
     *,
-    context_var: ContextVar[QueueListener] | None = None,
+    context_var: ContextVar[BatchedQueueListener] | None = None,
 ) -> Generator[BareQueueHandler]:
     """Context-manager to process logs from this handler in another thread"""
-    q: queue.Queue[logging.LogRecord] = queue.Queue()
+    q: queue.SimpleQueue[logging.LogRecord | None] = queue.SimpleQueue()
     q_handler: BareQueueHandler = BareQueueHandler(q)
-    q_listener: QueueListener = QueueListener(q, log_handler, respect_handler_level=True)
+    q_listener = BatchedQueueListener(q, log_handler, respect_handler_level=True)
     q_listener.start()
 
     with enter_context(context_var, q_listener) if context_var else contextlib.nullcontext():
@@ -281,9 +345,17 @@ class NoPaddingLogRender(LogRender):
 
 def _indent_text(text: Text, console: Console, indent: int) -> Text:
     """Indents each line of a Text object except the first one."""
+    width = console.width - indent
+    plain = text.plain
+    if "\n" not in plain and "\t" not in plain and text.cell_len <= width:
+        # Fast path for the common single line message: there is nothing to wrap nor indent
+        line = text.copy()
+        line.rstrip()
+        return line
+
     padding = Text("\n" + (" " * indent))
     new_text = Text()
-    first_line, *rest = text.wrap(console, width=console.width - indent)
+    first_line, *rest = text.wrap(console, width=width)
     for line in rest:
         line.rstrip()
         _ = new_text.append_text(padding + line)
@@ -412,9 +484,10 @@ def capture_logs() -> Generator[StringIO]:
 def export_logs(*, size_limit: float | None = None) -> bytes:
     flush_logs()
     log_file = MAIN_LOG_FILE.get()
-    if size_limit and log_file.stat().st_size > size_limit:
-        raise RuntimeError(f"Logs file '{log_file}' is too big. Max size expected: {size_limit}")
-    return log_file.read_bytes()
+    with log_file.open("rb") as fp:
+        if size_limit and os.fstat(fp.fileno()).st_size > size_limit:
+            raise RuntimeError(f"Logs file '{log_file}' is too big. Max size expected: {size_limit}")
+        return fp.read()
 
 
 def flush_logs() -> None:
@@ -103,6 +103,8 @@ class Manager:
             try:
                 yield self
             finally:
+                if self._hasher is not None:
+                    self._hasher.close()
                 del self.deduper
                 del self.sorter
 
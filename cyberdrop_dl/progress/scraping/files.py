@@ -24,7 +24,7 @@ class FileStats:
 
     @property
     def total(self) -> int:
-        return sum(dataclasses.astuple(self))
+        return self.completed + self.previously_completed + self.skipped + self.failed + self.queued
 
 
 @final
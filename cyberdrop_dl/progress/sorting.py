@@ -27,7 +27,7 @@ class SortStats:
 
     @property
     def total(self) -> int:
-        return sum(dataclasses.astuple(self))
+        return self.videos + self.audios + self.images + self.others + self.errors
 
 
 @final
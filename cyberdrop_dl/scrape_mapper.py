@@ -23,7 +23,6 @@ from cyberdrop_dl.scrape_source import (
     load_items_from_file,
     load_items_from_iterable,
 )
-from cyberdrop_dl.url_objects import AbsoluteHttpURL, ScrapeItem, ScrapeItemType
 from cyberdrop_dl.utils import remove_trailing_slash
 
 if TYPE_CHECKING:
@@ -36,6 +35,7 @@ if TYPE_CHECKING:
     from cyberdrop_dl.crawlers.http_direct import DirectHttpFileCrawler
     from cyberdrop_dl.crawlers.realdebrid import RealDebridCrawler
     from cyberdrop_dl.manager import Manager
+    from cyberdrop_dl.url_objects import AbsoluteHttpURL, ScrapeItem
 
 
 logger = logging.getLogger(__name__)
@@ -436,14 +436,15 @@ def _best_match[T](current_map: dict[str, T], domain: str) -> T | None:
         return found
 
 
-def _build_max_children_map(config: Config) -> dict[ScrapeItemType, int]:
+def _build_max_children_map(config: Config) -> tuple[int, int, int, int]:
+    # Indexed by ScrapeItemType value
     max_children = config.max_children
-    return {
-        ScrapeItemType.FORUM: max_children.forum,
-        ScrapeItemType.FORUM_POST: max_children.forum_post,
-        ScrapeItemType.PROFILE: max_children.profile,
-        ScrapeItemType.ALBUM: max_children.album,
-    }
+    return (
+        max_children.forum,
+        max_children.forum_post,
+        max_children.profile,
+        max_children.album,
+    )
 
 
 def _parse_source(
@@ -120,10 +120,10 @@ async def load_items_from_db(
     cursor = await db_conn.execute(query, (after.isoformat(), before.isoformat()))
     while rows := await cursor.fetchmany(_FETCH_MANY_SIZE):
         for row in rows:
-            yield _create_item_from_row(dict(row))
+            yield _create_item_from_row(row)
 
 
-def _create_item_from_row(row: Mapping[str, Any]) -> ScrapeItem:
+def _create_item_from_row(row: aiosqlite.Row | Mapping[str, Any]) -> ScrapeItem:
     referer: str = row["referer"]
     url = AbsoluteHttpURL(referer, encoded="%" in referer)
     item = ScrapeItem.from_url(url)
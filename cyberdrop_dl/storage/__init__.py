@@ -4,6 +4,7 @@ import asyncio
 import contextlib
 import logging
 import shutil
+import time
 from contextvars import ContextVar
 from typing import TYPE_CHECKING
 
@@ -47,15 +48,17 @@ async def has_sufficient_space(folder: Path, /, required_free_space: int | None
     return free_space == -1 or free_space > (required_free_space or _REQUIRED_FREE_SPACE.get())
 
 
-def create_free_space_checker(media_item: MediaItem, *, frequency: int = 5) -> Callable[[], Awaitable[None]]:
-    current_chunk = 0
+def create_free_space_checker(media_item: MediaItem, *, period: float = 1) -> Callable[[], Awaitable[None]]:
+    """Creates a checker that looks up the free space at most once every `period` seconds, regardless of chunk size"""
+    next_check = 0.0
 
     async def checker() -> None:
-        nonlocal current_chunk
-        if current_chunk % frequency == 0 and not await has_sufficient_space(media_item.download_folder):
+        nonlocal next_check
+        if (now := time.monotonic()) < next_check:
+            return
+        if not await has_sufficient_space(media_item.download_folder):
             raise InsufficientFreeSpaceError(media_item)
-
-        current_chunk += 1
+        next_check = now + period
 
     return checker
 
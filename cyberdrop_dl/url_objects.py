@@ -18,7 +18,7 @@ from cyberdrop_dl.exceptions import MaxChildrenError
 from cyberdrop_dl.filepath import sanitize_folder
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable, Mapping, Sequence
+    from collections.abc import Generator, Iterable, Sequence
 
     @final
     class AbsoluteHttpURL(yarl.URL):
@@ -142,19 +142,19 @@ class MediaItem:
     xxhash: str | None = None
 
     parents: tuple[AbsoluteHttpURL, ...] = dataclasses.field(default_factory=tuple)
+    headers: dict[str, str] = dataclasses.field(default_factory=dict)
     attempts: int = dataclasses.field(init=False, default=0)
     partial_file: Path = dataclasses.field(init=False, default=_FakePath())
     path: Path = dataclasses.field(init=False, default=_FakePath())
     downloaded: bool = dataclasses.field(init=False, default=False)
 
-    metadata: object = dataclasses.field(init=False, default_factory=dict)
+    metadata: object = dataclasses.field(init=False, default=None)
 
     uploaded_at_date: datetime.datetime | None = dataclasses.field(init=False, default=None)
     extra_info: dict[str, Any] = dataclasses.field(init=False, default_factory=dict)
 
     id: tuple[str, ...] = dataclasses.field(init=False)
     base64_id: str = dataclasses.field(init=False)
-    headers: dict[str, str] = dataclasses.field(init=False, default_factory=dict)
 
     def __post_init__(self) -> None:
         self.ext = self.ext or Path(self.filename).suffix
@@ -183,6 +183,8 @@ class MediaItem:
         me = dataclasses.asdict(self)
         if self.xxhash:
             me["xxhash"] = f"xxh128:{self.xxhash}"
+        if self.metadata is None:
+            me["metadata"] = {}
         for name in ("is_segment",):
             del me[name]
         return me
@@ -208,7 +210,7 @@ class ScrapeItem:
     folders: list[str] = dataclasses.field(default_factory=list)
     parents: list[AbsoluteHttpURL] = dataclasses.field(default_factory=list)
     parent_threads: set[AbsoluteHttpURL] = dataclasses.field(default_factory=set)
-    max_children: Mapping[ScrapeItemType, int] | None = None
+    max_children: tuple[int, int, int, int] = (0, 0, 0, 0)
     password: str | None = None
 
     _children_count: int = 0
@@ -250,14 +252,8 @@ class ScrapeItem:
     @type.setter  # noqa: A003
     def type(self, item_type: ScrapeItemType | None) -> None:
         self._type = item_type
-        self._children_count = self._children_limit = 0
-        if item_type is None or not self.max_children:
-            return
-
-        try:
-            self._children_limit = self.max_children[item_type]
-        except LookupError:
-            pass
+        self._children_count = 0
+        self._children_limit = 0 if item_type is None else self.max_children[item_type]
 
     @property
     @contextlib.contextmanager
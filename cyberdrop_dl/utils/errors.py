@@ -5,7 +5,7 @@ import functools
 import inspect
 import logging
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Concatenate, Protocol, cast, overload
+from typing import TYPE_CHECKING, Concatenate, NoReturn, Protocol, cast, overload
 
 import aiohttp.client_exceptions
 import mega.errors
@@ -45,49 +45,6 @@ def _clean_curl_error(e: object) -> str:
     return str(e).partition(". See https://curl.se/")[0]
 
 
-@contextlib.contextmanager
-def _curl_context() -> Generator[None]:
-    try:
-        yield
-    except curl_exceptions.Timeout as e:
-        log_msg = _clean_curl_error(repr(e))
-        raise CDLAppError("Timeout", log_msg) from None
-    except curl_exceptions.DNSError as e:
-        log_msg = _clean_curl_error(repr(e))
-        raise CDLAppError("Client Connector Error", log_msg) from None
-    except curl_exceptions.RequestException as e:
-        log_msg = _clean_curl_error(e)
-        raise CDLAppError(f"Curl Error ({e.code})", log_msg) from None
-
-
-@contextlib.contextmanager
-def _aiohttp_context() -> Generator[None]:
-    try:
-        yield
-    except aiohttp.client_exceptions.TooManyRedirects as e:
-        ui_failure = "Too Many Redirects"
-        info = {
-            "url": str(e.request_info.real_url),
-            "history": tuple(str(r.real_url) for r in e.history),
-        }
-        raise CDLAppError(ui_failure, f"{ui_failure}\n{info}") from None
-    except aiohttp.client_exceptions.ClientConnectorError as e:
-        raise CDLAppError("Client Connector Error", str(e)) from None
-
-
-@contextlib.contextmanager
-def _exc_group_context() -> Generator[None]:
-    try:
-        yield
-    except ExceptionGroup as e:
-        if e.message and "unhandled errors in a TaskGroup" not in e.message:
-            msg = e.message
-        else:
-            first = e.exceptions[0]
-            msg = getattr(first, "ui_failure", None) or str(first)
-        raise CDLAppError(msg, str(e)) from e.with_traceback(None)
-
-
 _MEGA_HTTP_CODES = Final = {
     -4: HTTPStatus.TOO_MANY_REQUESTS,
     -8: HTTPStatus.GONE,
@@ -99,11 +56,17 @@ _MEGA_HTTP_CODES = Final = {
 }
 
 
-@contextlib.contextmanager
-def _mega_nz_context() -> Generator[None]:
-    try:
-        yield
-    except mega.errors.RequestError as e:
+def _raise_from_exc_group(e: ExceptionGroup[Exception]) -> NoReturn:
+    if e.message and "unhandled errors in a TaskGroup" not in e.message:
+        msg = e.message
+    else:
+        first = e.exceptions[0]
+        msg = getattr(first, "ui_failure", None) or str(first)
+    raise CDLAppError(msg, str(e)) from e.with_traceback(None)
+
+
+def _raise_from_mega(e: mega.errors.MegaNzError) -> NoReturn:
+    if isinstance(e, mega.errors.RequestError):
         if e.code and (http_code := _MEGA_HTTP_CODES.get(e.code)):
             ui_failure = create_error_msg(http_code)
         else:
@@ -111,24 +74,53 @@ def _mega_nz_context() -> Generator[None]:
 
         raise CDLAppError(ui_failure, f"{ui_failure} {e.message}") from None
 
-    except mega.errors.MegaNzError as e:
-        raise CDLAppError("MegaNZ Error", str(e)) from None
+    raise CDLAppError("MegaNZ Error", str(e)) from None
+
+
+def _raise_from_curl(e: curl_exceptions.RequestException) -> NoReturn:
+    if isinstance(e, curl_exceptions.Timeout):
+        raise CDLAppError("Timeout", _clean_curl_error(repr(e))) from None
+    if isinstance(e, curl_exceptions.DNSError):
+        raise CDLAppError("Client Connector Error", _clean_curl_error(repr(e))) from None
+    raise CDLAppError(f"Curl Error ({e.code})", _clean_curl_error(e)) from None
+
+
+def _raise_from_aiohttp(
+    e: aiohttp.client_exceptions.TooManyRedirects | aiohttp.client_exceptions.ClientConnectorError,
+) -> NoReturn:
+    if isinstance(e, aiohttp.client_exceptions.TooManyRedirects):
+        ui_failure = "Too Many Redirects"
+        info = {
+            "url": str(e.request_info.real_url),
+            "history": tuple(str(r.real_url) for r in e.history),
+        }
+        raise CDLAppError(ui_failure, f"{ui_failure}\n{info}") from None
+
+    raise CDLAppError("Client Connector Error", str(e)) from None
 
 
 @contextlib.contextmanager
-def _pydantic_context() -> Generator[None]:
+def _known_errors_context() -> Generator[None]:
+    """Translates third party exceptions into `CDLAppError`.
+
+    A single try block instead of one context manager per library. This runs once per download and per scrape"""
     try:
         yield
+
+    except ExceptionGroup as e:
+        _raise_from_exc_group(e)
+    except mega.errors.MegaNzError as e:
+        _raise_from_mega(e)
+    except curl_exceptions.RequestException as e:
+        _raise_from_curl(e)
+    except (aiohttp.client_exceptions.TooManyRedirects, aiohttp.client_exceptions.ClientConnectorError) as e:
+        _raise_from_aiohttp(e)
+
     except ValidationError as e:
         ui_failure = create_error_msg(422)
         log_msg = str(e).partition("For further information")[0].strip()
         raise CDLAppError(ui_failure, log_msg) from e
 
-
-@contextlib.contextmanager
-def _builtin_context() -> Generator[None]:
-    try:
-        yield
     except NotImplementedError as e:
         raise CDLAppError("NotImplemented") from e
     except TimeoutError as e:
@@ -146,14 +138,7 @@ def error_handling_context(self: _HasManager, item: ScrapeItem | MediaItem | yar
     app_error = origin = exc = None
     real_url: yarl.URL | str = ""
     try:
-        with (
-            _builtin_context(),
-            _pydantic_context(),
-            _aiohttp_context(),
-            _curl_context(),
-            _mega_nz_context(),
-            _exc_group_context(),
-        ):
+        with _known_errors_context():
             yield
 
     except CDLBaseError as e:
@@ -75,7 +75,8 @@ class Rendition:
     subtitle: M3U8 | None
 
     def __iter__(self) -> Iterator[M3U8 | None]:
-        return iter(dataclasses.astuple(self))
+        # astuple would deep copy every M3U8 object
+        return iter((self.video, self.audio, self.subtitle))
 
 
 @dataclasses.dataclass(frozen=True, slots=True, order=True)
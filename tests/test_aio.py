@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from cyberdrop_dl import aio
+
+
+async def test_move_replaces_existing_file(tmp_path: Path) -> None:
+    src, dst = tmp_path / "video.mp4.part", tmp_path / "video.mp4"
+    src.write_bytes(b"new")
+    dst.write_bytes(b"old")
+    assert await aio.move(src, dst) == dst
+    assert not src.exists()
+    assert dst.read_bytes() == b"new"
+
+
+async def test_move_into_directory(tmp_path: Path) -> None:
+    src, folder = tmp_path / "video.mp4", tmp_path / "folder"
+    src.write_bytes(b"data")
+    folder.mkdir()
+    assert await aio.move(src, folder) == folder / "video.mp4"
+    assert (folder / "video.mp4").read_bytes() == b"data"
+
+
+async def test_open_w_parents_creates_missing_folders(tmp_path: Path) -> None:
+    file = tmp_path / "a" / "b" / "video.mp4.part"
+    async with aio.open_w_parents(file, "ab") as f:
+        await f.write(b"data")
+    assert file.read_bytes() == b"data"
+
+
+async def test_open_w_parents_writes_buffers(tmp_path: Path) -> None:
+    file = tmp_path / "video.mp4.part"
+    buffer = bytearray(b"abcdef")
+    async with aio.open_w_parents(file, "wb") as f:
+        await f.write(buffer)
+        await f.write(memoryview(buffer)[:3])
+    assert file.read_bytes() == b"abcdefabc"
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import sqlite3
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
 from cyberdrop_dl import aio, scrape_mapper
 from cyberdrop_dl.crawlers.crawler import _prepare_download_path
 from cyberdrop_dl.database import Database, common, schema
+from cyberdrop_dl.database.history import HistoryTable
 from cyberdrop_dl.exceptions import DatabaseError
 from cyberdrop_dl.scrape_source import _create_item_from_row
-from cyberdrop_dl.url_objects import AbsoluteHttpURL, ScrapeItem
+from cyberdrop_dl.url_objects import AbsoluteHttpURL, MediaItem, ScrapeItem
 from cyberdrop_dl.utils import parse_url
 
 _MOCK_ROW = {
@@ -121,6 +125,25 @@ async def test_pre_allocation(tmp_cwd: Path) -> None:
     assert size >= 250e6
 
 
+async def test_pre_allocation_is_skipped_in_wal_mode(tmp_cwd: Path) -> None:
+    db_file = tmp_cwd / "test_db.db"
+    async with common.connect(db_file) as db:
+        assert await common.set_pragmas(db, db_file)
+        await common.pre_allocate_250mb(db)
+
+    size = await aio.get_size(db_file)
+    assert size < 250e6
+
+
+async def test_new_database_is_pre_allocated(tmp_cwd: Path) -> None:
+    db_file = tmp_cwd / "test_db.db"
+    async with Database(db_file):
+        pass
+
+    size = await aio.get_size(db_file)
+    assert size >= 250e6
+
+
 async def test_database_version_check(tmp_cwd: Path) -> None:
     db_file = tmp_cwd / "test_db.db"
     db_file.touch()
@@ -151,7 +174,19 @@ async def test_db_schema_dump(tmp_cwd: Path) -> None:
     async with Database(db_file) as db:
         current_schema = await schema.dump(db.conn)
 
-    assert current_schema == schema.V9_15_0
+    assert current_schema == schema.CURRENT_SCHEMA
+
+
+async def test_db_schema_update_adds_created_at_index(tmp_cwd: Path) -> None:
+    db_file = tmp_cwd / "test_db.db"
+    async with Database(db_file) as db:
+        await db.conn.executescript("DROP INDEX idx_media_created_at; DELETE FROM schema_version;")
+        await db.schema.update(schema.Version(10, 0, 0))
+
+    async with Database(db_file) as db:
+        assert db.schema.up_to_date
+        assert await db.schema.get_version() == schema.CURRENT_VERSION
+        assert await schema.dump(db.conn) == schema.V10_1_0
 
 
 def test_create_item_from_row() -> None:
@@ -172,3 +207,94 @@ def test_create_item_from_row() -> None:
     assert info.url_path == url_path
     assert info.download_path == Path(download_path)
     assert info.download_filename == download_filename
+
+
+def _media_item(url_path: str, *, album_id: str | None = None) -> MediaItem:
+    url = AbsoluteHttpURL(f"https://example.com{url_path}")
+    return MediaItem(
+        url=url,
+        domain="example.com",
+        referer=url,
+        download_folder=Path("downloads"),
+        filename=f"{url.name}.mp4",
+        db_path=url_path,
+        original_filename=f"{url.name}.mp4",
+        album_id=album_id,
+    )
+
+
+async def test_insert_incompleted_batches_concurrent_calls(tmp_cwd: Path) -> None:
+    items = [_media_item(f"/file/{idx}") for idx in range(5)]
+    async with Database(tmp_cwd / "test_db.db") as db:
+        original = HistoryTable.insert_incompleted_many
+        with mock.patch.object(HistoryTable, "insert_incompleted_many", autospec=True, side_effect=original) as spy:
+            await asyncio.gather(*(db.history.insert_incompleted("example.com", item) for item in items))
+            await db.history.insert_incompleted("other.com", items[0])
+
+        # One flush for the concurrent calls, one for the last call
+        assert spy.await_count == 2
+        assert db.history._incompleted_flush is None
+        assert not db.history._pending_incompleted
+
+        for item in items:
+            assert await db.history.check_complete("example.com", item.db_path) == (str(item.referer), False)
+        assert await db.history.check_complete("other.com", items[0].db_path) == (str(items[0].referer), False)
+
+        await db.history.mark_complete("example.com", items[0])
+        assert await db.history.check_complete("example.com", items[0].db_path) == (str(items[0].referer), True)
+
+
+async def test_insert_incompleted_claims_no_crawler_rows(tmp_cwd: Path) -> None:
+    claimable, conflicting = _media_item("/file/1"), _media_item("/file/2")
+    async with Database(tmp_cwd / "test_db.db") as db:
+        await db.history.insert_incompleted_many("example.com", [conflicting])
+        await db.history.insert_incompleted_many("no_crawler", [claimable, conflicting])
+
+        await asyncio.gather(*(db.history.insert_incompleted("example.com", item) for item in (claimable, conflicting)))
+
+        for item in (claimable, conflicting):
+            assert await db.history.check_complete("example.com", item.db_path) == (str(item.referer), False)
+            assert await db.history.check_complete("no_crawler", item.db_path) == ("", False)
+
+        cursor = await db.conn.execute("SELECT COUNT(*) FROM media")
+        row = await cursor.fetchone()
+        assert row is not None
+        assert row[0] == 2
+
+
+async def test_query_album(tmp_cwd: Path) -> None:
+    done, pending = _media_item("/file/1", album_id="album"), _media_item("/file/2", album_id="album")
+    other_album = _media_item("/file/3", album_id="other")
+    async with Database(tmp_cwd / "test_db.db") as db:
+        assert await db.history.query_album("example.com", "album") == {}
+
+        await db.history.insert_incompleted_many("example.com", [done, pending, other_album])
+        await db.history.mark_complete("example.com", done)
+
+        results = await db.history.query_album("example.com", "album")
+        assert results == {done.db_path: True, pending.db_path: False}
+        assert all(type(completed) is bool for completed in results.values())
+        assert await db.history.query_album("other.com", "album") == {}
+
+
+async def test_readers_see_committed_writes(tmp_cwd: Path) -> None:
+    item = _media_item("/file/1")
+    async with Database(tmp_cwd / "test_db.db") as db:
+        assert len(db.readers) == 2
+        readers = {id(db.history.reader) for _ in db.readers}
+        assert readers == {id(reader) for reader in db.readers}
+        assert id(db.conn) not in readers
+
+        await db.history.insert_incompleted_many("example.com", [item])
+        for _ in db.readers:
+            assert await db.history.check_complete("example.com", item.db_path) == (str(item.referer), False)
+
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            await db.readers[0].execute("DELETE FROM media")
+
+
+async def test_in_memory_database_reads_from_writer() -> None:
+    async with Database(Path(":memory:")) as db:
+        assert not db.readers
+        assert db.history.reader is db.conn
+        assert db.hash.reader is db.conn
@@ -6,7 +6,8 @@ from unittest.mock import patch
 
 import pytest
 
-from cyberdrop_dl.dedupe import _delete_file, _filter_db_matches
+from cyberdrop_dl.database import Database
+from cyberdrop_dl.dedupe import Czkawka, _delete_file, _filter_db_matches
 
 
 @pytest.fixture
@@ -87,3 +88,41 @@ class TestFilterDbMatches:
 
     def test_filtering_no_rows(self) -> None:
         assert list(_filter_db_matches([], Path("/a/dir"))) == []
+
+
+async def test_dedupe_groups_db_matches_by_hash_and_size(tmp_path: Path) -> None:
+    # More hashes than fit in a single query, so the lookup is split in chunks
+    n_hashes = 1_000
+    base_dir = tmp_path / "downloads"
+    base_dir.mkdir()
+    file_hashes: dict[str, dict[int, set[Path]]] = {}
+    files: list[tuple[str, str, int, str]] = []
+    for idx in range(n_hashes):
+        original, duplicate = base_dir / f"original_{idx}.txt", base_dir / f"duplicate_{idx}.txt"
+        duplicate.write_text("12345")
+        files += [(str(base_dir), original.name, 5, f"hash_{idx}"), (str(base_dir), duplicate.name, 5, f"hash_{idx}")]
+        file_hashes[f"hash_{idx}"] = {5: {duplicate}}
+
+    # Same hash as the first file, but a different size. Must not be deleted
+    other_size = base_dir / "other_size.txt"
+    other_size.write_text("1234567890")
+    files.append((str(base_dir), other_size.name, 10, "hash_0"))
+
+    async with Database(tmp_path / "test_db.db") as db:
+        await db.conn.executemany(
+            "INSERT INTO files (folder, download_filename, file_size) VALUES (?, ?, ?)",
+            [file[:3] for file in files],
+        )
+        await db.hash.insert_or_update_hashes_many(
+            (hash_value, "xxh128", Path(folder, name)) for folder, name, _, hash_value in files
+        )
+
+        rows = await db.hash.get_files_with_hash_matches_many(file_hashes, "xxh128")
+        assert len(rows) == len(files)
+
+        dedupe = Czkawka(base_dir, db, use_trash_bin=False)
+        await dedupe._dedupe(file_hashes)
+
+    assert dedupe.stats.deleted == n_hashes
+    assert not any(base_dir.glob("duplicate_*"))
+    assert other_size.exists()
@@ -169,6 +169,23 @@ def test_parse_null_duration(duration: str) -> None:
     assert output is None
 
 
+@pytest.mark.parametrize(
+    ("avg_frame_rate", "expected"),
+    [
+        ("30000/1001", 30000 / 1001),
+        ("25/1", 25),
+        ("60", 60),
+        ("29.97", 29.97),
+        ("0/0", None),
+        ("0", None),
+        ("0.0", None),
+        (None, None),
+    ],
+)
+def test_parse_fps(avg_frame_rate: str | None, expected: float | None) -> None:
+    assert ffmpeg._parse_fps(avg_frame_rate) == expected
+
+
 class TestMergeSubs:
     def test_normal_merge(self, tmp_path: Path) -> None:
         srcs = [tmp_path / f"sub{i}.srt" for i in range(1, 4)]
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Literal
 
 import pytest
 
-from cyberdrop_dl.hasher import Hasher, _compute_hash, hash_directory
+from cyberdrop_dl.hasher import Hasher, _compute_hash, _compute_hashes, hash_directory
 
 if TYPE_CHECKING:
     from cyberdrop_dl.manager import Manager
@@ -96,3 +96,30 @@ def test_compute_hash(tmp_cwd: Path, algo: Literal["xxh128", "md5", "sha256"], e
     file.write_bytes(license_file.read_text("utf8").encode())  # Remove windows EOL
     result = _compute_hash(file, algo)
     assert result == expected
+
+
+def test_compute_hashes_matches_single_pass(tmp_cwd: Path) -> None:
+    file = tmp_cwd / "file"
+    file.write_bytes(b"cyberdrop-dl" * 200_000)
+    algos = ("xxh128", "md5", "sha256")
+    assert _compute_hashes(file, algos) == {algo: _compute_hash(file, algo) for algo in algos}
+
+
+async def test_hasher_pool_is_created_lazily_and_closed(tmp_cwd: Path, manager: Manager) -> None:
+    file = tmp_cwd / "file"
+    file.write_bytes(b"cyberdrop-dl")
+    hasher = Hasher.create(manager.config, manager.database, tmp_cwd)
+    assert hasher._pool is None
+
+    assert await hasher.hash_file(file, "md5") == _compute_hash(file, "md5")
+    pool = hasher._pool
+    assert pool is not None
+
+    hasher.close()
+    assert hasher._pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
+
+    # Using it again after close creates a new pool
+    assert await hasher.hash_file(file, "md5") == _compute_hash(file, "md5")
+    hasher.close()
@@ -101,3 +101,12 @@ def test_entering_a_live_disables_console_logging() -> None:
     assert "This msg SHOULD show up" in text
     assert "This msg SHOULD NOT show up" not in text
     assert "This msg also SHOULD show up" in text
+
+
+@pytest.mark.parametrize("sep", ["/", "\\", "\\\\"])
+def test_redacted_console_removes_username(sep: str) -> None:
+    user = logs._USER_NAME
+    message = f"file at {sep.join(('home', user, 'video.mp4'))}"
+    redacted = logs.RedactedConsole._redact_message(message)
+    assert redacted == f"file at {sep.join(('home', '[REDACTED]', 'video.mp4'))}"
+    assert logs.RedactedConsole._redact_message("nothing to redact") == "nothing to redact"